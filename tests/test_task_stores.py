@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""MemoryTaskStore 与 SQLiteTaskStore 的一致性与 load → 修改 → persist 往返测试"""
+
+import contextlib
+import io
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from todo_manager import (MemoryTaskStore, ScoringRules, SQLiteTaskStore, TaskQuery, TodoManager,
+                          _from_day_number, _today_day_number)
+
+
+def quiet(action, *args, **kwargs):
+    """执行会打印的管理器操作，丢弃输出"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return action(*args, **kwargs)
+
+
+def in_days(days: int) -> str:
+    return _from_day_number(_today_day_number() + days)
+
+
+def current_tasks(store, board: str = 'default', query: TaskQuery = TaskQuery()):
+    """比较用的当前任务快照 (不含自增 id 和时间戳)"""
+    return sorted((record.task_uuid, record.version, record.task, record.status, record.priority,
+                   record.due_date, record.due_day, record.operation_type)
+                  for record in store.iter_current(board, query))
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / 'tasks.db')
+    manager = TodoManager(path)
+    quiet(manager.create_task, '写周报', 'important', in_days(2), 'writing', 1)
+    quiet(manager.create_task, '修复登录故障', 'urgent_important', in_days(-1), 'bug', 4)
+    quiet(manager.create_task, '整理桌面', 'normal', None)
+    quiet(manager.create_task, '季度规划', 'important', in_days(20), 'planning', 8)
+    return path
+
+
+def test_load_matches_sqlite(db_path):
+    sqlite_store = SQLiteTaskStore(db_path, ScoringRules())
+    memory_store = MemoryTaskStore.load(db_path)
+    today = _today_day_number()
+    for query in (TaskQuery(), TaskQuery(status='todo'), TaskQuery(keyword='周报'),
+                  TaskQuery(due_from=today, due_to=today + 7), TaskQuery(due_to=today - 1),
+                  TaskQuery(quadrant='Q1', today=today), TaskQuery(open_only=True, today=today)):
+        assert current_tasks(memory_store, query=query) == current_tasks(sqlite_store, query=query)
+    top_sqlite = [record.task_uuid for record in sqlite_store.iter_current('default', TaskQuery(top=2, today=today))]
+    top_memory = [record.task_uuid for record in memory_store.iter_current('default', TaskQuery(top=2, today=today))]
+    assert top_memory == top_sqlite
+
+
+def test_mutate_and_persist_round_trip(db_path):
+    memory_store = MemoryTaskStore.load(db_path)
+    manager = TodoManager(store=memory_store)
+    created = quiet(manager.create_task, '内存中新建', 'urgent', in_days(1))
+    tasks = {record.task: record.task_uuid for record in memory_store.iter_current('default')}
+    quiet(manager.update_task, tasks['写周报'], 'status', 'completed')
+    quiet(manager.update_task, tasks['季度规划'], 'priority', 'urgent_important')
+    quiet(manager.delete_task, tasks['整理桌面'])
+    quiet(manager.add_recurring, '站会', 'daily', None, 'important', 'meeting', 0.25)
+    expected = current_tasks(memory_store)
+    
+    loaded, skipped = memory_store.persist()
+    assert (loaded, skipped) == (4, [])
+    
+    sqlite_store = SQLiteTaskStore(db_path, ScoringRules())
+    assert current_tasks(sqlite_store) == expected
+    assert created in {record[0] for record in expected}
+    assert [template.task for template in sqlite_store.iter_templates('default')] == ['站会']
+    assert [record.version for record in sqlite_store.history('default', tasks['季度规划'])] == [2, 1]
+    # 再次载入得到同样的快照，已写回的记录不会重复写入
+    assert current_tasks(MemoryTaskStore.load(db_path)) == expected
+    assert memory_store.persist() == (0, [])
+
+
+def test_persist_needs_target_without_source(tmp_path):
+    memory_store = MemoryTaskStore()
+    quiet(TodoManager(store=memory_store).create_task, '独立任务')
+    with pytest.raises(ValueError):
+        memory_store.persist()
+    target = str(tmp_path / 'new.db')
+    assert memory_store.persist(target) == (1, [])
+    assert [record[2] for record in current_tasks(SQLiteTaskStore(target, ScoringRules()))] == ['独立任务']
+
+
+def test_load_missing_file(tmp_path):
+    path = str(tmp_path / 'missing.db')
+    with pytest.raises(FileNotFoundError):
+        MemoryTaskStore.load(path)
+    assert not os.path.exists(path)
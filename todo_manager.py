@@ -5,88 +5,891 @@
 基于艾森豪威尔矩阵的科学任务管理
 """
 
+import abc
 import sqlite3
 import sys
 import os
 import json
 import uuid
-from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
+import io
+import time
+import random
+import struct
+import bisect
+import calendar
+import functools
+import hashlib
+import heapq
+from collections import Counter, OrderedDict
+from contextlib import contextmanager, redirect_stdout
+from datetime import datetime, timedelta, date, timezone
+from types import MappingProxyType
+from typing import Optional, List, Dict, Any, Mapping, NamedTuple
 
-class TodoManager:
-    def __init__(self, db_path: str = "/Users/cloudv/Desktop/todo-sqlite/simple.db"):
-        """初始化任务管理器"""
-        self.db_path = db_path
-        self.init_database()
-        self.setup_enhanced_priority_system()
+# 日期数字化: 以 1970-01-01 为第0天的整数天数
+_EPOCH_DATE = date(1970, 1, 1)
+
+# SQLite 中当前日期的整数天数 (写入 created_day)；文本日期一律在 Python 中用 _to_day_number 换算
+_SQL_DAY_NOW = "CAST(julianday('now') - 2440587.5 AS INTEGER)"
+
+# 数据库维护
+_MAINTAIN_STEP_PAGES = 2000     # 增量回收每步释放的页数 (每步一个短写事务)
+_ANALYZE_LIMIT = 1000           # ANALYZE 每个索引最多抽样的行数 (PRAGMA analysis_limit)
+_AUTO_MAINTAIN_WRITES = 1000    # 自动维护: 距上次维护的写事务数达到该值时做一次轻量维护
+
+# 可更新的任务字段
+_UPDATABLE_FIELDS = ('task', 'status', 'priority', 'due_date', 'task_type', 'estimated_hours')
+
+# 当前版本过滤: 每个任务只取最新版本 (走 task_uuid, version 复合索引)
+_LATEST_VERSION_SQL = ("u.version = (SELECT MAX(v.version) FROM todo_unified v "
+                       "WHERE v.board = u.board AND v.task_uuid = u.task_uuid)")
+
+
+def _to_day_number(value: Optional[str]) -> Optional[int]:
+    """把 YYYY-MM-DD[ HH:MM:SS] 文本转换为整数天数，无效值返回 None"""
+    if not value:
+        return None
+    try:
+        return (datetime.strptime(str(value)[:10], '%Y-%m-%d').date() - _EPOCH_DATE).days
+    except ValueError:
+        return None
+
+
+def _from_day_number(day: int) -> str:
+    """把整数天数还原为 YYYY-MM-DD 文本"""
+    return (_EPOCH_DATE + timedelta(days=day)).isoformat()
+
+
+def _today_day_number() -> int:
+    """今天对应的整数天数 (本地日期)"""
+    return (date.today() - _EPOCH_DATE).days
+
+
+# ============ 共享的只读展示/评分元数据 (所有评分结果引用同一份，不做拷贝) ============
+
+# 艾森豪威尔矩阵定义
+_EISENHOWER_MATRIX_SPEC = {
+    'urgent_important': {
+        'name': '紧急且重要',
+        'description': '立即处理 - 危机管理',
+        'icon': '🔥',
+        'bg_color': '\033[41m',  # 红色背景
+        'text_color': '\033[97m', # 白色文字
+        'weight': 100,
+        'action': '🚨 立即执行',
+        'quadrant': 'Q1',
+        'tips': ('集中注意力', '消除干扰', '全力以赴完成')
+    },
+    'important': {  # 兼容旧系统
+        'name': '重要但不紧急', 
+        'description': '计划安排 - 战略发展',
+        'icon': '⭐',
+        'bg_color': '\033[43m',  # 黄色背景
+        'text_color': '\033[30m', # 黑色文字
+        'weight': 80,
+        'action': '📅 计划安排',
+        'quadrant': 'Q2',
+        'tips': ('制定详细计划', '分配充足时间', '定期检查进度')
+    },
+    'urgent': {  # 兼容旧系统
+        'name': '紧急但不重要',
+        'description': '委托处理 - 干扰管理', 
+        'icon': '⚡',
+        'bg_color': '\033[45m',  # 紫色背景
+        'text_color': '\033[97m', # 白色文字
+        'weight': 60,
+        'action': '🤝 委托授权',
+        'quadrant': 'Q3',
+        'tips': ('寻找合适的人选', '提供清晰指导', '设定检查节点')
+    },
+    'normal': {  # 兼容旧系统
+        'name': '既不紧急也不重要',
+        'description': '消除删除 - 时间浪费',
+        'icon': '📝',
+        'bg_color': '\033[42m',  # 绿色背景
+        'text_color': '\033[30m', # 黑色文字
+        'weight': 20,
+        'action': '🗑️ 考虑删除',
+        'quadrant': 'Q4',
+        'tips': ('评估真实价值', '考虑完全删除', '或推迟到空闲时间')
+    }
+}
+
+# 时间压力说明
+_TIME_PRESSURE_SPEC = {
+    0.5: {'level': '极高压力', 'desc': '已逾期', 'color': '🚨', 'advice': '立即处理'},
+    0.4: {'level': '高压力', 'desc': '今明截止', 'color': '🔥', 'advice': '优先安排'},
+    0.3: {'level': '中压力', 'desc': '3天内', 'color': '⚡', 'advice': '及时处理'},
+    0.2: {'level': '低压力', 'desc': '1周内', 'color': '⏰', 'advice': '计划安排'},
+    0.1: {'level': '微压力', 'desc': '1周以上', 'color': '📅', 'advice': '从容安排'},
+    0.0: {'level': '无压力', 'desc': '无截止', 'color': '🟢', 'advice': '灵活处理'}
+}
+
+# 任务类型权重表
+_TASK_TYPE_WEIGHTS = MappingProxyType({
+    # [紧急响应]
+    'emergency': 0.4,         # 紧急事务
+    'security': 0.4,          # 安全相关
+    'bug_fix': 0.35,          # Bug修复
     
-    def setup_enhanced_priority_system(self):
-        """设置增强的优先级系统"""
-        # 艾森豪威尔矩阵定义
-        self.eisenhower_matrix = {
-            'urgent_important': {
-                'name': '紧急且重要',
-                'description': '立即处理 - 危机管理',
-                'icon': '🔥',
-                'bg_color': '\033[41m',  # 红色背景
-                'text_color': '\033[97m', # 白色文字
-                'weight': 100,
-                'action': '🚨 立即执行',
-                'quadrant': 'Q1',
-                'tips': ['集中注意力', '消除干扰', '全力以赴完成']
-            },
-            'important': {  # 兼容旧系统
-                'name': '重要但不紧急', 
-                'description': '计划安排 - 战略发展',
-                'icon': '⭐',
-                'bg_color': '\033[43m',  # 黄色背景
-                'text_color': '\033[30m', # 黑色文字
-                'weight': 80,
-                'action': '📅 计划安排',
-                'quadrant': 'Q2',
-                'tips': ['制定详细计划', '分配充足时间', '定期检查进度']
-            },
-            'urgent': {  # 兼容旧系统
-                'name': '紧急但不重要',
-                'description': '委托处理 - 干扰管理', 
-                'icon': '⚡',
-                'bg_color': '\033[45m',  # 紫色背景
-                'text_color': '\033[97m', # 白色文字
-                'weight': 60,
-                'action': '🤝 委托授权',
-                'quadrant': 'Q3',
-                'tips': ['寻找合适的人选', '提供清晰指导', '设定检查节点']
-            },
-            'normal': {  # 兼容旧系统
-                'name': '既不紧急也不重要',
-                'description': '消除删除 - 时间浪费',
-                'icon': '📝',
-                'bg_color': '\033[42m',  # 绿色背景
-                'text_color': '\033[30m', # 黑色文字
-                'weight': 20,
-                'action': '🗑️ 考虑删除',
-                'quadrant': 'Q4',
-                'tips': ['评估真实价值', '考虑完全删除', '或推迟到空闲时间']
-            }
+    # [业务核心]
+    'client': 0.3,            # 客户相关
+    'deadline': 0.3,          # 有明确截止日期
+    'development': 0.2,       # 开发任务
+    
+    # [协调沟通]
+    'meeting': 0.25,          # 会议
+    'communication': 0.15,    # 沟通协调
+    
+    # [支撑运营]
+    'maintenance': 0.08,      # 维护任务
+    'routine': 0.05,          # 日常事务
+    
+    # [发展提升]
+    'research': 0.12,         # 研究任务
+    
+    # [通用任务]
+    'general': 0.0            # 普通任务
+})
+
+_EISENHOWER_MATRIX = MappingProxyType({key: MappingProxyType(info) for key, info in _EISENHOWER_MATRIX_SPEC.items()})
+_TIME_PRESSURE_LEVELS = MappingProxyType({key: MappingProxyType(info) for key, info in _TIME_PRESSURE_SPEC.items()})
+
+# 时间压力档位名称 -> 展示信息键 (time_pressure_levels 的键)
+_PRESSURE_LEVEL_KEYS = {
+    'overdue': 0.5,
+    'today_tomorrow': 0.4,
+    'within_3_days': 0.3,
+    'within_week': 0.2,
+    'later': 0.1,
+}
+
+# 默认评分规则 (可通过 JSON 配置文件覆盖任意部分)
+_DEFAULT_SCORING_RULES = {
+    # 基础权重
+    'base_weights': {'urgent_important': 100, 'important': 80, 'urgent': 60, 'normal': 20},
+    # 任务类型加成
+    'type_weights': dict(_TASK_TYPE_WEIGHTS),
+    # 工作量加成: [小时上限(含), 加成]，上限为 null 表示其余
+    'effort_buckets': [[0, 0.0], [2, 0.05], [8, 0.1], [24, 0.15], [None, 0.2]],
+    # 时间压力: 剩余天数上限(含) 与压力系数
+    'time_pressure': {
+        'overdue': {'max_remaining_days': 0, 'pressure': 0.5},
+        'today_tomorrow': {'max_remaining_days': 1, 'pressure': 0.4},
+        'within_3_days': {'max_remaining_days': 3, 'pressure': 0.3},
+        'within_week': {'max_remaining_days': 7, 'pressure': 0.2},
+        'later': {'pressure': 0.1},
+    },
+    # 最终优先级: 动态权重下限(含)，按从高到低匹配
+    'priority_thresholds': [[120, 'urgent_important'], [90, 'important'], [60, 'urgent'], [None, 'normal']],
+    # 动态权重上限
+    'weight_cap': 150,
+}
+
+_QUADRANTS = {'urgent_important': 'Q1', 'important': 'Q2', 'urgent': 'Q3', 'normal': 'Q4'}
+
+
+def _merge_rules(base: Dict[str, Any], override: Dict[str, Any]):
+    """把 override 逐层合并进 base: 两边都是字典的项递归合并，其余直接替换"""
+    for key, value in override.items():
+        if isinstance(base.get(key), dict) and isinstance(value, dict):
+            _merge_rules(base[key], value)
+        else:
+            base[key] = value
+
+
+class ScoringRules:
+    """智能优先级评分规则: 从配置加载并编译为查找表，Python 评分与 SQLite 函数共用同一份规则"""
+    
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        rules = json.loads(json.dumps(_DEFAULT_SCORING_RULES))
+        for key, value in (config or {}).items():
+            if key not in rules:
+                raise ValueError(f"未知的评分规则项: {key}")
+            if isinstance(rules[key], dict) and isinstance(value, dict):
+                _merge_rules(rules[key], value)
+            else:
+                rules[key] = value
+        self.config = rules
+        self.fingerprint = json.dumps(rules, sort_keys=True)
+        
+        # 优先级名称必须是矩阵中的象限 (展示信息、象限映射都以它为键)
+        if not isinstance(rules['base_weights'], dict):
+            raise ValueError("基础权重需要是 {优先级: 权重} 的映射")
+        unknown = [name for name in rules['base_weights'] if name not in _EISENHOWER_MATRIX]
+        if unknown:
+            raise ValueError(f"未知的基础权重优先级: {', '.join(map(str, unknown))}")
+        if 'normal' not in rules['base_weights']:
+            raise ValueError("基础权重必须包含 normal (未知优先级按 normal 计算)")
+        if not rules['priority_thresholds']:
+            raise ValueError("最终优先级阈值不能为空")
+        for item in rules['priority_thresholds']:
+            if len(item) != 2 or item[1] not in _EISENHOWER_MATRIX:
+                raise ValueError(f"无效的最终优先级阈值: {item} (优先级须为 {', '.join(_EISENHOWER_MATRIX)} 之一)")
+        
+        self.base_weights = dict(rules['base_weights'])
+        self.type_weights = {key.lower(): float(value) for key, value in rules['type_weights'].items()}
+        self.weight_cap = float(rules['weight_cap'])
+        
+        # 工作量: 升序上限 + bisect 定位，必须以上限为 null 的兜底分档结尾
+        if not rules['effort_buckets'] or any(len(item) != 2 for item in rules['effort_buckets']):
+            raise ValueError("工作量分档需要是非空的 [小时上限, 加成] 列表")
+        effort = sorted(rules['effort_buckets'], key=lambda item: float('inf') if item[0] is None else item[0])
+        if [limit for limit, _ in effort].count(None) != 1:
+            raise ValueError("工作量分档需要恰好一个上限为 null 的兜底分档")
+        self.effort_limits = [float('inf') if limit is None else float(limit) for limit, _ in effort]
+        self.effort_values = [float(value) for _, value in effort]
+        
+        # 时间压力: 按剩余天数预先展开为数组，评分时直接下标访问
+        # 除 later 外每个档位都要有剩余天数上限，且按档位顺序不递减 (缺上限的档位会变成兜底档位，静默错算)
+        levels = []
+        previous = None
+        for name, level in rules['time_pressure'].items():
+            if name not in _PRESSURE_LEVEL_KEYS:
+                raise ValueError(f"未知的时间压力档位: {name}")
+            if not isinstance(level, dict) or level.get('pressure') is None:
+                raise ValueError(f"时间压力档位 {name} 缺少 pressure")
+            limit = level.get('max_remaining_days')
+            if (limit is None) != (name == 'later'):
+                raise ValueError(f"时间压力档位 {name} " + ("不能设置 max_remaining_days" if name == 'later' else "缺少 max_remaining_days"))
+            if limit is not None:
+                if previous is not None and limit < previous[1]:
+                    raise ValueError(f"时间压力档位 {name} 的 max_remaining_days ({limit}) 小于 {previous[0]} 的 ({previous[1]})")
+                previous = (name, limit)
+            levels.append((limit, float(level['pressure']), _PRESSURE_LEVEL_KEYS[name]))
+        bounded = sorted(level for level in levels if level[0] is not None)
+        unbounded = [level for level in levels if level[0] is None]
+        self.pressure_min_day = int(bounded[0][0])
+        self.pressure_max_day = int(bounded[-1][0])
+        self.pressure_table = []
+        for remaining in range(self.pressure_min_day, self.pressure_max_day + 2):
+            match = next((level for level in bounded if remaining <= level[0]), unbounded[0])
+            self.pressure_table.append((match[1], match[2]))
+        # 档位切换点: 剩余天数从 r + 1 减少到 r 时进入新的档位
+        self.pressure_steps = [
+            remaining for remaining in range(self.pressure_min_day, self.pressure_max_day + 1)
+            if self.pressure_table[remaining - self.pressure_min_day] != self.pressure_table[remaining + 1 - self.pressure_min_day]
+        ]
+        
+        # 最终优先级: 降序阈值
+        thresholds = sorted(rules['priority_thresholds'], key=lambda item: float('-inf') if item[0] is None else item[0], reverse=True)
+        self.priority_thresholds = [(float('-inf') if limit is None else float(limit), priority) for limit, priority in thresholds]
+    
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> 'ScoringRules':
+        """从 JSON 文件加载规则，未指定时使用默认规则"""
+        if not path:
+            return cls()
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+    
+    def base_weight(self, priority: Optional[str]) -> float:
+        return self.base_weights.get(priority, self.base_weights['normal'])
+    
+    def type_weight(self, task_type: Optional[str]) -> float:
+        return self.type_weights.get((task_type or 'general').lower(), 0.0)
+    
+    def effort_weight(self, estimated_hours: Optional[float]) -> float:
+        return self.effort_values[bisect.bisect_left(self.effort_limits, estimated_hours or 0)]
+    
+    def time_pressure(self, due_day: Optional[int], today: int) -> tuple:
+        """返回 (压力系数, 展示信息键, 剩余天数)"""
+        if due_day is None:
+            return 0.0, 0.0, None
+        # 与原 (due - now).days 语义一致: 截止日零点减去当前时刻，当天已过去的部分不计入
+        remaining = due_day - today - 1
+        index = min(max(remaining, self.pressure_min_day), self.pressure_max_day + 1) - self.pressure_min_day
+        pressure, level_key = self.pressure_table[index]
+        return pressure, level_key, remaining
+    
+    def next_escalation_day(self, due_day: Optional[int], today: int) -> Optional[int]:
+        """today 之后第一次进入新时间压力档位的日期 (整数天数)，不会再升级时返回 None"""
+        if due_day is None:
+            return None
+        index = bisect.bisect_left(self.pressure_steps, due_day - today - 1) - 1
+        if index < 0:
+            return None
+        return due_day - 1 - self.pressure_steps[index]
+    
+    def final_priority(self, weight: float) -> str:
+        for limit, priority in self.priority_thresholds:
+            if weight >= limit:
+                return priority
+        return self.priority_thresholds[-1][1]
+    
+    def dynamic_weight(self, priority, due_day, task_type, estimated_hours, today) -> float:
+        """动态权重 = 基础权重 × (1 + 时间压力 + 类型加成 + 工作量)，不超过上限"""
+        pressure = self.time_pressure(due_day, today)[0]
+        weight = self.base_weight(priority) * (1 + pressure + self.type_weight(task_type) + self.effort_weight(estimated_hours))
+        return min(weight, self.weight_cap)
+    
+    def smart_weight(self, priority, due_day, task_type, estimated_hours, today) -> float:
+        """SQLite 函数 smart_weight(priority, due_day, task_type, estimated_hours, today)"""
+        return round(self.dynamic_weight(priority, due_day, task_type, estimated_hours, today), 1)
+    
+    def smart_quadrant(self, priority, due_day, task_type, estimated_hours, today) -> str:
+        """SQLite 函数 smart_quadrant(priority, due_day, task_type, estimated_hours, today)，返回 Q1-Q4"""
+        return _QUADRANTS.get(self.final_priority(self.dynamic_weight(priority, due_day, task_type, estimated_hours, today)), 'Q4')
+    
+    def register(self, conn: sqlite3.Connection):
+        """在连接上注册确定性函数，使排序和象限筛选在查询引擎内完成"""
+        for name, function in (('smart_weight', self.smart_weight), ('smart_quadrant', self.smart_quadrant)):
+            try:
+                conn.create_function(name, 5, function, deterministic=True)
+            except (TypeError, sqlite3.NotSupportedError):
+                # 旧版 Python/SQLite 不支持 deterministic 标记
+                conn.create_function(name, 5, function)
+
+
+class TaskScore(NamedTuple):
+    """单个任务的智能优先级评分 (紧凑的只读记录，展示元数据共享引用)"""
+    task_uuid: str
+    task: str
+    base_priority: str
+    final_priority: str
+    base_weight: float
+    dynamic_weight: float
+    time_pressure: float
+    pressure_key: float
+    remaining_days: Optional[int]
+    type_bonus: float
+    effort_bonus: float
+    due_date: Optional[str]
+    created_at: Optional[str]
+    
+    @property
+    def time_pressure_info(self) -> Mapping[str, Any]:
+        """时间压力展示信息 (共享只读映射)"""
+        return _TIME_PRESSURE_LEVELS[self.pressure_key]
+    
+    @property
+    def display_info(self) -> Mapping[str, Any]:
+        """最终象限展示信息 (共享只读映射)"""
+        return _EISENHOWER_MATRIX[self.final_priority]
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """转换为旧版 calculate_smart_priority 的字典格式"""
+        time_pressure_info = dict(self.time_pressure_info)
+        if self.remaining_days is not None:
+            time_pressure_info['remaining_days'] = self.remaining_days
+        return {
+            'task_uuid': self.task_uuid,
+            'task': self.task,
+            'base_priority': self.base_priority,
+            'final_priority': self.final_priority,
+            'base_weight': self.base_weight,
+            'dynamic_weight': self.dynamic_weight,
+            'time_pressure': self.time_pressure,
+            'time_pressure_info': time_pressure_info,
+            'type_bonus': self.type_bonus,
+            'effort_bonus': self.effort_bonus,
+            # 共享的只读展示信息用元组保存，输出时还原为旧版的列表
+            'display_info': {key: list(value) if isinstance(value, tuple) else value
+                             for key, value in self.display_info.items()},
+            'due_date': self.due_date,
+            'created_at': self.created_at
         }
+
+
+class TaskScoreTable:
+    """列式存储的批量评分结果，每个字段一个列表，按需还原为 TaskScore"""
+    __slots__ = TaskScore._fields
+    
+    def __init__(self):
+        for field in TaskScore._fields:
+            setattr(self, field, [])
+    
+    def append(self, score: TaskScore):
+        """追加一条评分"""
+        for field, value in zip(TaskScore._fields, score):
+            getattr(self, field).append(value)
+    
+    def __len__(self) -> int:
+        return len(self.task_uuid)
+    
+    def __getitem__(self, index: int) -> TaskScore:
+        return TaskScore(*(getattr(self, field)[index] for field in TaskScore._fields))
+    
+    def __iter__(self):
+        return map(TaskScore._make, zip(*(getattr(self, field) for field in TaskScore._fields)))
+    
+    def ranked(self, limit: Optional[int] = None) -> List[TaskScore]:
+        """按动态权重降序返回评分 (权重相同时保持查询顺序)"""
+        weights = self.dynamic_weight
+        order = sorted(range(len(weights)), key=weights.__getitem__, reverse=True)
+        if limit is not None:
+            order = order[:limit]
+        return [self[index] for index in order]
+
+
+class ReadCache:
+    """读命令结果缓存: 按 (命令, 参数, 日期) 缓存渲染输出，数据版本令牌变化即整体失效，LRU 淘汰
+    
+    path 为空时只在内存中缓存 (嵌入/服务进程)，否则持久化为 JSON 文件 (CLI 跨进程复用)。
+    """
+    
+    def __init__(self, max_entries: int = 64, max_bytes: int = 4 * 1024 * 1024, path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.path = path
+        self.token = None
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        if path:
+            self._load()
+    
+    def get(self, key: str, token: str) -> Optional[str]:
+        """命中返回缓存输出，令牌不一致时清空全部条目"""
+        if token != self.token:
+            self._reset(token)
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+    
+    def put(self, key: str, token: str, value: str):
+        """写入缓存并按条目数和总大小淘汰最久未使用的条目"""
+        if token != self.token:
+            self._reset(token)
+        if key in self.entries:
+            self.size -= len(self.entries.pop(key))
+        self.entries[key] = value
+        self.size += len(value)
+        while self.entries and (len(self.entries) > self.max_entries or self.size > self.max_bytes):
+            _, evicted = self.entries.popitem(last=False)
+            self.size -= len(evicted)
+        if self.path:
+            self._save()
+    
+    def _reset(self, token: str):
+        self.token = token
+        self.entries.clear()
+        self.size = 0
+    
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.token = data['token']
+            self.entries = OrderedDict(data['entries'])
+            self.size = sum(len(value) for value in self.entries.values())
+        except (OSError, ValueError, KeyError, TypeError):
+            self._reset(None)
+    
+    def _save(self):
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'token': self.token, 'entries': list(self.entries.items())}, f, ensure_ascii=False)
+            os.replace(temp_path, self.path)
+        except OSError:
+            # 缓存写入失败不影响命令本身
+            pass
+
+
+class LiveBoard:
+    """watch 模式的内存排名结构: 按任务增量重算评分，始终保持按动态权重有序
+    
+    排序键为 (-动态权重, -最新版本id)，与 list 命令 "权重降序、最近修改优先" 的顺序一致。
+    """
+    
+    def __init__(self, score_row, status_filter: Optional[str] = None):
+        self.score_row = score_row
+        self.status_filter = status_filter
+        self.today = _today_day_number()
+        self.rows = {}      # task_uuid -> (id, version, 评分所需的行数据)
+        self.scores = {}    # task_uuid -> TaskScore
+        self.keys = {}      # task_uuid -> 排序键
+        self.order = []     # 有序的排序键列表
+    
+    def apply(self, row_id: int, version: int, status: str, operation_type: str, score_row: tuple) -> bool:
+        """应用一条新追加的版本记录，返回该任务在面板上是否发生变化"""
+        task_uuid = score_row[0]
+        current = self.rows.get(task_uuid)
+        if current and current[1] > version:
+            return False
         
-        # 重置颜色
-        self.reset_color = '\033[0m'
+        changed = self._remove(task_uuid)
+        if operation_type == 'delete' or (self.status_filter and status != self.status_filter):
+            self.rows.pop(task_uuid, None)
+            return changed
         
-        # 时间压力说明
-        self.time_pressure_levels = {
-            0.5: {'level': '极高压力', 'desc': '已逾期', 'color': '🚨', 'advice': '立即处理'},
-            0.4: {'level': '高压力', 'desc': '今明截止', 'color': '🔥', 'advice': '优先安排'},
-            0.3: {'level': '中压力', 'desc': '3天内', 'color': '⚡', 'advice': '及时处理'},
-            0.2: {'level': '低压力', 'desc': '1周内', 'color': '⏰', 'advice': '计划安排'},
-            0.1: {'level': '微压力', 'desc': '1周以上', 'color': '📅', 'advice': '从容安排'},
-            0.0: {'level': '无压力', 'desc': '无截止', 'color': '🟢', 'advice': '灵活处理'}
+        self.rows[task_uuid] = (row_id, version, score_row)
+        self._insert(task_uuid)
+        return True
+    
+    def rebucket(self, today: int):
+        """日期变化后按新的日期重算全部时间压力"""
+        self.today = today
+        self.scores.clear()
+        self.keys.clear()
+        self.order = []
+        for task_uuid in self.rows:
+            self._insert(task_uuid)
+    
+    def ranked(self) -> List[TaskScore]:
+        """按动态权重降序返回评分"""
+        return [self.scores[key[2]] for key in self.order]
+    
+    def __len__(self) -> int:
+        return len(self.order)
+    
+    def _insert(self, task_uuid: str):
+        row_id, _, score_row = self.rows[task_uuid]
+        score = self.score_row(score_row, self.today)
+        key = (-score.dynamic_weight, -row_id, task_uuid)
+        self.scores[task_uuid] = score
+        self.keys[task_uuid] = key
+        bisect.insort(self.order, key)
+    
+    def _remove(self, task_uuid: str) -> bool:
+        key = self.keys.pop(task_uuid, None)
+        if key is None:
+            return False
+        del self.scores[task_uuid]
+        del self.order[bisect.bisect_left(self.order, key)]
+        return True
+
+
+# ============ 近似重复检测: 字符 shingle + MinHash + LSH 分桶 ============
+
+_SHINGLE_SIZE = 2               # 字符 2-gram，对中文短文本也有足够的区分度
+_MINHASH_PERMUTATIONS = 32
+_LSH_BANDS = 8                  # 8 段 x 4 行: 相似度 0.8 的任务约 98% 概率至少落入一个相同的桶
+_DUPLICATE_THRESHOLD = 0.8      # 候选对的精确 Jaccard 相似度下限
+_LSH_BUCKET_SCAN = 32           # dedupe 时每个任务最多精确比较的候选数 (防止短文本扎堆的大桶退化为平方)
+_MINHASH_STRUCT = struct.Struct(f'<{_MINHASH_PERMUTATIONS}I')
+
+
+@functools.lru_cache(maxsize=65536)
+def _shingle_hashes(shingle: str) -> tuple:
+    """单个 shingle 在各个哈希函数下的 32 位取值 (一次 SHAKE-128 输出切分，跨进程稳定)"""
+    return _MINHASH_STRUCT.unpack(hashlib.shake_128(shingle.encode('utf-8')).digest(_MINHASH_STRUCT.size))
+
+
+def _char_shingles(text: Optional[str]) -> frozenset:
+    """归一化 (小写、去掉空白和标点) 后的字符 shingle 集合"""
+    normalized = ''.join(char for char in (text or '').lower() if char.isalnum())
+    if len(normalized) <= _SHINGLE_SIZE:
+        return frozenset([normalized]) if normalized else frozenset()
+    return frozenset(normalized[i:i + _SHINGLE_SIZE] for i in range(len(normalized) - _SHINGLE_SIZE + 1))
+
+
+def _minhash_signature(shingles: frozenset) -> tuple:
+    """MinHash 签名: 每个哈希函数取全部 shingle 中的最小值"""
+    return tuple(map(min, zip(*map(_shingle_hashes, shingles))))
+
+
+def _lsh_band_keys(signature: tuple) -> List[int]:
+    """把签名切成若干段，每段散列为一个桶键 (56 位整数，可直接存入 SQLite INTEGER)"""
+    rows = len(signature) // _LSH_BANDS
+    return [
+        int.from_bytes(hashlib.blake2b(repr((band,) + signature[band * rows:(band + 1) * rows]).encode(),
+                                       digest_size=7).digest(), 'big')
+        for band in range(_LSH_BANDS)
+    ]
+
+
+def _task_band_keys(text: Optional[str]) -> List[int]:
+    """任务文本的 LSH 桶键，文本为空时为空列表"""
+    shingles = _char_shingles(text)
+    return _lsh_band_keys(_minhash_signature(shingles)) if shingles else []
+
+
+def _jaccard(left: frozenset, right: frozenset) -> float:
+    if not left or not right:
+        return 0.0
+    shared = len(left & right)
+    return shared / (len(left) + len(right) - shared)
+
+
+class LSHIndex:
+    """内存中的 LSH 桶索引: 桶键 -> task_uuid 集合"""
+    
+    def __init__(self):
+        self.buckets = {}
+        self.keys = {}          # task_uuid -> 桶键列表
+    
+    def add(self, task_uuid: str, band_keys: List[int]):
+        self.remove(task_uuid)
+        self.keys[task_uuid] = band_keys
+        for key in band_keys:
+            self.buckets.setdefault(key, set()).add(task_uuid)
+    
+    def remove(self, task_uuid: str):
+        for key in self.keys.pop(task_uuid, ()):
+            bucket = self.buckets.get(key)
+            if bucket is not None:
+                bucket.discard(task_uuid)
+                if not bucket:
+                    del self.buckets[key]
+    
+    def candidates(self, band_keys: List[int]) -> set:
+        result = set()
+        for key in band_keys:
+            result.update(self.buckets.get(key, ()))
+        return result
+
+
+class TaskRecord(NamedTuple):
+    """一条任务版本记录 (与 todo_unified 的列一一对应)"""
+    id: Optional[int]
+    task_uuid: str
+    version: int
+    task: str
+    status: str
+    priority: str
+    due_date: Optional[str]
+    task_type: str
+    estimated_hours: float
+    operation_type: str
+    change_summary: Optional[str]
+    created_at: Optional[str]
+    updated_at: Optional[str]
+    due_day: Optional[int]
+    created_day: Optional[int]
+    board: str
+    
+    def score_row(self) -> tuple:
+        """评分所需的列 (TodoManager._score_row 的输入格式)"""
+        return (self.task_uuid, self.task, self.priority, self.due_date, self.created_at,
+                self.task_type, self.estimated_hours, self.due_day)
+
+
+# 新任务各字段的默认值 (与 todo_unified 的列默认值一致)
+_NEW_TASK_DEFAULTS = MappingProxyType({
+    'task': '', 'status': 'todo', 'priority': 'normal', 'due_date': None,
+    'task_type': 'general', 'estimated_hours': 0,
+})
+
+
+class TaskQuery(NamedTuple):
+    """当前版本查询条件，由存储引擎翻译为 SQL 或内存索引查找"""
+    task_uuid: Optional[str] = None
+    status: Optional[str] = None
+    open_only: bool = False             # 排除已完成的任务
+    due_from: Optional[int] = None      # 截止天数下界 (含)
+    due_to: Optional[int] = None        # 截止天数上界 (含)
+    keyword: Optional[str] = None
+    quadrant: Optional[str] = None      # 只取智能象限 Q1-Q4
+    order_by: str = 'created'           # created (最新创建在前) | id | due
+    top: Optional[int] = None           # 只取动态权重最高的 N 个
+    today: Optional[int] = None
+
+
+# 重复任务规则
+_RECURRENCE_RULES = ('daily', 'weekly', 'monthly')
+_WEEKDAY_NAMES = ('mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun')
+_WEEKDAY_LABELS = ('一', '二', '三', '四', '五', '六', '日')
+_RECURRING_LOOKAHEAD = 7        # 查询未指定日期范围时，每个模板只展开这么多天内最近的一次
+
+
+def _weekday(day: int) -> int:
+    """整数天数对应的星期 (0 = 周一；1970-01-01 是周四)"""
+    return (day + 3) % 7
+
+
+class RecurringTemplate(NamedTuple):
+    """重复任务模板 (todo_recurring 的一行)
+    
+    实例不落库: 查询时按规则在请求的日期窗口内即时展开为虚拟记录，只有被更新、完成或删除的
+    实例才写入 todo_unified。实例 UUID 由模板 UUID 前 24 位加 12 位十六进制的日期天数组成，
+    可以直接反解出模板和日期。
+    """
+    template_uuid: str
+    board: str
+    task: str
+    priority: str
+    task_type: str
+    estimated_hours: float
+    rule: str                       # daily | weekly | monthly
+    weekdays: tuple                 # weekly: 星期几 (0 = 周一)
+    month_day: Optional[int]        # monthly: 每月几号 (超过当月天数时取月末)
+    start_day: int
+    end_day: Optional[int]
+    created_at: Optional[str]
+    active: bool = True
+    
+    @classmethod
+    def from_row(cls, row: tuple) -> 'RecurringTemplate':
+        """从数据库行还原 (weekdays 以逗号分隔的文本存储)"""
+        template = cls._make(row)
+        weekdays = tuple(int(value) for value in (template.weekdays or '').split(',') if value != '')
+        return template._replace(weekdays=weekdays, active=bool(template.active))
+    
+    def to_row(self) -> tuple:
+        return self._replace(weekdays=','.join(map(str, self.weekdays)), active=int(self.active))
+    
+    def occurrence_days(self, day_from: int, day_to: int):
+        """窗口 [day_from, day_to] 内各实例的日期 (升序)"""
+        first = max(day_from, self.start_day)
+        last = day_to if self.end_day is None else min(day_to, self.end_day)
+        if first > last:
+            return
+        if self.rule == 'daily':
+            yield from range(first, last + 1)
+        elif self.rule == 'weekly':
+            for day in range(first, last + 1):
+                if _weekday(day) in self.weekdays:
+                    yield day
+        elif self.rule == 'monthly':
+            current = _EPOCH_DATE + timedelta(days=first)
+            year, month = current.year, current.month
+            while True:
+                month_day = min(self.month_day, calendar.monthrange(year, month)[1])
+                day = (date(year, month, month_day) - _EPOCH_DATE).days
+                if day > last:
+                    return
+                if day >= first:
+                    yield day
+                year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    
+    def occurrence_uuid(self, day: int) -> str:
+        return f'{self.template_uuid[:24]}{day:012x}'
+    
+    def occurrence(self, day: int) -> TaskRecord:
+        """某一天的虚拟实例 (id 为 None、version 为 0，表示尚未写入)"""
+        return TaskRecord(
+            None, self.occurrence_uuid(day), 0, self.task, 'todo', self.priority, _from_day_number(day),
+            self.task_type, self.estimated_hours, 'recurring', f'Recurring template {self.template_uuid}',
+            self.created_at, self.created_at, day, None, self.board
+        )
+    
+    @property
+    def rule_text(self) -> str:
+        if self.rule == 'daily':
+            return '每天'
+        if self.rule == 'weekly':
+            return '每周' + '、'.join(_WEEKDAY_LABELS[weekday] for weekday in self.weekdays)
+        return f'每月{self.month_day}日'
+
+
+def _split_occurrence_uuid(task_uuid: str) -> Optional[tuple]:
+    """把实例 UUID 拆成 (模板 UUID 前 24 位, 日期天数)，格式不符返回 None"""
+    if len(task_uuid) != 36:
+        return None
+    try:
+        return task_uuid[:24], int(task_uuid[24:], 16)
+    except ValueError:
+        return None
+
+
+class TaskStore(abc.ABC):
+    """任务存储引擎接口: 追加版本、取最新版本、遍历当前任务、历史、搜索、批量载入
+    
+    引擎在构造时取得所需的上下文 (数据库路径、评分规则等)，不依赖 TodoManager；
+    rules 属性是引擎按智能象限/权重筛选排序时使用的评分规则。
+    """
+    
+    rules: ScoringRules
+    
+    @abc.abstractmethod
+    def append_version(self, board: str, task_uuid: str, changes: Dict[str, Any],
+                       operation_type: str, change_summary: str) -> Optional[TaskRecord]:
+        """在最新版本基础上合并 changes 写入下一个版本 (create 时写入版本 1)，任务不存在返回 None"""
+    
+    @abc.abstractmethod
+    def get_latest(self, board: str, task_uuid: str) -> Optional[TaskRecord]:
+        """任务的最新版本 (含已软删除的)"""
+    
+    @abc.abstractmethod
+    def iter_current(self, board: str, query: TaskQuery = TaskQuery()):
+        """按条件遍历当前未删除的任务 (每个任务的最新版本)"""
+    
+    @abc.abstractmethod
+    def history(self, board: str, task_uuid: str) -> List[TaskRecord]:
+        """任务的全部版本，最新的在前"""
+    
+    def search(self, board: str, keyword: str, due_from: Optional[int] = None, due_to: Optional[int] = None):
+        """按关键词搜索当前任务"""
+        return self.iter_current(board, TaskQuery(keyword=keyword, due_from=due_from, due_to=due_to))
+    
+    @abc.abstractmethod
+    def bulk_load(self, records, templates=()) -> tuple:
+        """在一次写入中载入一批版本记录 (及重复任务模板 templates)，返回 (载入数, [(task_uuid, 错误)])"""
+    
+    @abc.abstractmethod
+    def iter_records(self, board: Optional[str] = None):
+        """按创建时间遍历全部版本记录 (导出、快照用)"""
+    
+    @abc.abstractmethod
+    def similar_candidates(self, board: str, band_keys: List[int]) -> set:
+        """LSH 索引中与给定桶键至少共享一个桶的 task_uuid (候选，需再做精确比较)"""
+    
+    @abc.abstractmethod
+    def reindex_similarity(self, board: str, entries):
+        """用 [(task_uuid, 桶键列表)] 重建看板的 LSH 索引"""
+    
+    @abc.abstractmethod
+    def save_template(self, template: 'RecurringTemplate'):
+        """新增或替换重复任务模板 (created_at 为 None 时取当前时间)"""
+    
+    @abc.abstractmethod
+    def iter_templates(self, board: str, active_only: bool = True):
+        """遍历看板的重复任务模板 (按创建时间)"""
+    
+    @abc.abstractmethod
+    def existing_uuids(self, board: Optional[str], task_uuids: List[str]) -> set:
+        """task_uuids 中已有版本记录的那些 (用于跳过已写入的重复任务实例)，board 为 None 时查所有看板"""
+
+
+# TaskRecord 各列的 SQL 选择列表
+_RECORD_COLUMNS = ', '.join(f'u.{field}' for field in TaskRecord._fields)
+
+
+class SQLiteTaskStore(TaskStore):
+    """SQLite 存储引擎: 自行管理连接、BEGIN IMMEDIATE 写事务与冲突重试
+    
+    db_path: 数据库文件 (构造时建表/迁移)
+    rules: 评分规则，注册为连接上的 smart_weight / smart_quadrant 函数
+    owner: 看板负责人，首次在看板中写入时登记
+    busy_timeout / max_retries / retry_backoff: 见 TodoManager
+    auto_maintain: 每累计 _AUTO_MAINTAIN_WRITES 次写事务后自动做一次轻量维护
+    """
+    
+    # TaskQuery.order_by -> SQL 排序
+    ORDER_BY = {'created': 'u.created_at DESC', 'id': 'u.id', 'due': 'u.due_day'}
+    
+    def __init__(self, db_path: str, rules: ScoringRules, owner: Optional[str] = None,
+                 busy_timeout: float = 5.0, max_retries: int = 5, retry_backoff: float = 0.05,
+                 auto_maintain: bool = False):
+        self.db_path = db_path
+        self.rules = rules
+        self.owner = owner
+        self.busy_timeout = busy_timeout
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.auto_maintain = auto_maintain
+        self._maintenance_due = False
+        # 上次维护时的 write_counter，记在数据库旁的文件里 (None 表示尚未读取)
+        self._maintain_state_path = f"{db_path}.maintain.json"
+        self._maintained_counter = None
+        # 并发写入统计
+        self.write_stats = {
+            'transactions': 0,       # 成功提交的写事务
+            'lock_waits': 0,         # 获取写锁时发生等待的次数
+            'lock_wait_seconds': 0.0,
+            'busy_errors': 0,        # 超过 busy_timeout 仍未拿到锁
+            'version_conflicts': 0,  # (task_uuid, version) 唯一约束冲突
+            'retries': 0,
         }
+        self.init_database()
     
     def init_database(self):
         """初始化数据库表结构"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.connect() as conn:
             cursor = conn.cursor()
+            # 新数据库直接使用增量 auto_vacuum (必须在建表前设置；已有数据库由 maintain 切换)。
+            # 只对空文件设置: 对已有数据库执行该 PRAGMA 也会改写文件头，递增其他连接看到的 data_version
+            if cursor.execute('PRAGMA page_count').fetchone()[0] == 0:
+                cursor.execute('PRAGMA auto_vacuum=INCREMENTAL')
+            # WAL 模式: 读写互不阻塞，多个写进程排队提交
+            cursor.execute('PRAGMA journal_mode=WAL')
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS todo_unified (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -101,7 +904,10 @@ class TodoManager:
                     operation_type TEXT CHECK(operation_type IN ('create', 'update', 'status_change', 'delete', 'restore', 'current_snapshot', 'migration')) DEFAULT 'update',
                     change_summary TEXT,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    due_day INTEGER,
+                    created_day INTEGER,
+                    board TEXT NOT NULL DEFAULT 'default'
                 )
             ''')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_task_uuid ON todo_unified(task_uuid)')
@@ -119,24 +925,1088 @@ class TodoManager:
             if 'estimated_hours' not in columns:
                 cursor.execute('ALTER TABLE todo_unified ADD COLUMN estimated_hours REAL DEFAULT 0')
             
+            # 如果没有整数天数字段，添加它 (在下方从文本日期回填)
+            if 'due_day' not in columns:
+                cursor.execute('ALTER TABLE todo_unified ADD COLUMN due_day INTEGER')
+            
+            if 'created_day' not in columns:
+                cursor.execute('ALTER TABLE todo_unified ADD COLUMN created_day INTEGER')
+            
+            # 如果没有看板字段，添加它 (已有任务归入 default 看板)
+            if 'board' not in columns:
+                cursor.execute("ALTER TABLE todo_unified ADD COLUMN board TEXT NOT NULL DEFAULT 'default'")
+            
+            # 日期范围查询索引 + 最新版本查找索引
+            try:
+                # 同一任务的版本号唯一，防止并发写入产生重复版本
+                cursor.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_task_uuid_version_unique ON todo_unified(task_uuid, version)')
+                cursor.execute('DROP INDEX IF EXISTS idx_task_uuid_version')
+            except sqlite3.IntegrityError:
+                print("⚠️ 检测到重复的任务版本号，暂未启用 (task_uuid, version) 唯一约束")
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_task_uuid_version ON todo_unified(task_uuid, version)')
+            # 看板前缀的复合索引: 每个看板的查询只扫描本看板的数据
+            # 最新版本查找 (board, task_uuid, version)
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_board_task_version ON todo_unified(board, task_uuid, version)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_board_status ON todo_unified(board, status)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_board_due_day ON todo_unified(board, due_day)')
+            # 按事件日期圈定任务 (stats 的日期范围)，覆盖索引无需回表
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_board_created_day_task ON todo_unified(board, created_day, task_uuid)')
+            for legacy_index in ('idx_due_day', 'idx_created_day', 'idx_created_day_task'):
+                cursor.execute(f'DROP INDEX IF EXISTS {legacy_index}')
+            
+            # 元数据表: 写入计数器等 (每次写事务递增，用于读缓存失效)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS todo_meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                )
+            ''')
+            cursor.execute("INSERT OR IGNORE INTO todo_meta (key, value) VALUES ('write_counter', 0)")
+            
+            # 一次性回填整数天数: 与写入路径同用 _to_day_number 解析，兼容未补零的日期 (如 2025-1-5)，
+            # 也修复早先用 julianday 回填而留下的 NULL
+            cursor.execute("SELECT 1 FROM todo_meta WHERE key = 'day_numbers_backfilled'")
+            if cursor.fetchone() is None:
+                for column, source in (('due_day', 'due_date'), ('created_day', 'created_at')):
+                    cursor.execute(f'SELECT id, {source} FROM todo_unified WHERE {source} IS NOT NULL AND {column} IS NULL')
+                    cursor.executemany(f'UPDATE todo_unified SET {column} = ? WHERE id = ?',
+                                       [(_to_day_number(value), row_id) for row_id, value in cursor.fetchall()])
+                cursor.execute("INSERT INTO todo_meta (key, value) VALUES ('day_numbers_backfilled', 1)")
+            
+            # 近似重复检测的 LSH 桶索引: 每个当前任务每段一行
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS todo_lsh (
+                    board TEXT NOT NULL,
+                    band_key INTEGER NOT NULL,
+                    task_uuid TEXT NOT NULL
+                )
+            ''')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_lsh_board_band ON todo_lsh(board, band_key)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_lsh_task ON todo_lsh(task_uuid)')
+            
+            # 升级前已有的任务: 一次性为所有看板的当前任务回填桶键
+            cursor.execute("SELECT 1 FROM todo_meta WHERE key = 'lsh_backfilled'")
+            if cursor.fetchone() is None:
+                cursor.execute(f'''
+                    SELECT u.board, u.task_uuid, u.task FROM todo_unified u
+                    WHERE {_LATEST_VERSION_SQL} AND u.operation_type != 'delete'
+                ''')
+                current = cursor.fetchall()
+                cursor.execute('DELETE FROM todo_lsh')
+                cursor.executemany('INSERT INTO todo_lsh (board, band_key, task_uuid) VALUES (?, ?, ?)',
+                                   ((board, key, task_uuid) for board, task_uuid, task in current
+                                    for key in _task_band_keys(task)))
+                cursor.execute("INSERT INTO todo_meta (key, value) VALUES ('lsh_backfilled', 1)")
+            
+            # 重复任务模板: 实例查询时即时展开，只有被修改的实例才写入 todo_unified
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS todo_recurring (
+                    template_uuid TEXT PRIMARY KEY,
+                    board TEXT NOT NULL DEFAULT 'default',
+                    task TEXT NOT NULL,
+                    priority TEXT DEFAULT 'normal',
+                    task_type TEXT DEFAULT 'general',
+                    estimated_hours REAL DEFAULT 0,
+                    rule TEXT NOT NULL,
+                    weekdays TEXT,
+                    month_day INTEGER,
+                    start_day INTEGER NOT NULL,
+                    end_day INTEGER,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    active INTEGER DEFAULT 1
+                )
+            ''')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_recurring_board ON todo_recurring(board, active)')
+            
+            # 看板登记表: 负责人与归档状态 (归档的看板只读)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS todo_boards (
+                    board TEXT PRIMARY KEY,
+                    owner TEXT,
+                    archived INTEGER DEFAULT 0,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    archived_at TIMESTAMP
+                )
+            ''')
+            # 一次性登记已有数据中的看板 (之后的写入路径自行登记)，避免每次启动都扫描全表
+            cursor.execute("SELECT 1 FROM todo_meta WHERE key = 'boards_backfilled'")
+            if cursor.fetchone() is None:
+                cursor.execute('''
+                    INSERT OR IGNORE INTO todo_boards (board)
+                    SELECT DISTINCT board FROM todo_unified
+                ''')
+                cursor.execute("INSERT INTO todo_meta (key, value) VALUES ('boards_backfilled', 1)")
+            
             conn.commit()
     
-    def create_task(self, task: str, priority: str = 'normal', due_date: str = None, task_type: str = 'general', estimated_hours: float = 0) -> str:
-        """创建新任务"""
-        task_uuid = str(uuid.uuid4())
+    def connect(self) -> sqlite3.Connection:
+        """打开数据库连接 (带 busy_timeout，注册评分函数)"""
+        conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout)
+        conn.execute(f'PRAGMA busy_timeout = {int(self.busy_timeout * 1000)}')
+        self.rules.register(conn)
+        return conn
+    
+    @contextmanager
+    def write_transaction(self):
+        """BEGIN IMMEDIATE 写事务: 开始即持有写锁，读取最新版本与写入新版本之间不会被其他写者插入"""
+        conn = self.connect()
+        conn.isolation_level = None
+        try:
+            started = time.monotonic()
+            conn.execute('BEGIN IMMEDIATE')
+            waited = time.monotonic() - started
+            if waited > 0.001:
+                self.write_stats['lock_waits'] += 1
+                self.write_stats['lock_wait_seconds'] += waited
+            try:
+                yield conn.cursor()
+                conn.execute("UPDATE todo_meta SET value = value + 1 WHERE key = 'write_counter'")
+                if self.auto_maintain:
+                    written = conn.execute("SELECT value FROM todo_meta WHERE key = 'write_counter'").fetchone()[0]
+                    self._maintenance_due = self._writes_since_maintenance(int(written)) >= _AUTO_MAINTAIN_WRITES
+                conn.execute('COMMIT')
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            self.write_stats['transactions'] += 1
+        finally:
+            conn.close()
+    
+    def run_write(self, operation, board: Optional[str] = None):
+        """在写事务中执行 operation(cursor)，锁冲突或版本冲突时带抖动指数退避重试
         
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
+        board: 先确认该看板未归档 (看板管理和索引维护传 None 跳过检查)
+        """
+        attempt = 0
+        while True:
+            try:
+                with self.write_transaction() as cursor:
+                    if board is not None:
+                        self._check_board_writable(cursor, board)
+                    result = operation(cursor)
+                if self._maintenance_due:
+                    self._auto_maintain()
+                return result
+            except sqlite3.OperationalError as e:
+                message = str(e).lower()
+                if 'locked' not in message and 'busy' not in message:
+                    raise
+                self.write_stats['busy_errors'] += 1
+                if attempt >= self.max_retries:
+                    raise
+            except sqlite3.IntegrityError as e:
+                if 'unique' not in str(e).lower():
+                    raise
+                self.write_stats['version_conflicts'] += 1
+                if attempt >= self.max_retries:
+                    raise
+            
+            attempt += 1
+            self.write_stats['retries'] += 1
+            time.sleep(self.retry_backoff * (2 ** (attempt - 1)) * random.uniform(0.5, 1.5))
+    
+    def _check_board_writable(self, cursor, board: str):
+        """归档的看板拒绝写入"""
+        cursor.execute('SELECT archived FROM todo_boards WHERE board = ?', (board,))
+        row = cursor.fetchone()
+        if row and row[0]:
+            raise ValueError(f"看板 {board} 已归档，只读 (可用 board restore {board} 恢复)")
+    
+    def append_version(self, board, task_uuid, changes, operation_type, change_summary):
+        def write_version(cursor):
+            if operation_type == 'create':
+                cursor.execute('INSERT OR IGNORE INTO todo_boards (board, owner) VALUES (?, ?)',
+                               (board, self.owner))
+                values, version = dict(_NEW_TASK_DEFAULTS), 1
+            else:
+                # 已持有写锁，读取最新版本与分配版本号是原子的
+                cursor.execute('''
+                    SELECT task, status, priority, due_date, task_type, estimated_hours, version
+                    FROM todo_unified
+                    WHERE board = ? AND task_uuid = ?
+                    ORDER BY version DESC LIMIT 1
+                ''', (board, task_uuid))
+                current = cursor.fetchone()
+                if not current:
+                    return None
+                values = dict(zip(('task', 'status', 'priority', 'due_date', 'task_type', 'estimated_hours'), current))
+                values['task_type'] = values['task_type'] or 'general'
+                values['estimated_hours'] = values['estimated_hours'] or 0
+                version = current[6] + 1
+            values.update(changes)
+            
+            cursor.execute(f'''
                 INSERT INTO todo_unified (
-                    task_uuid, version, task, priority, due_date, task_type, estimated_hours,
-                    operation_type, change_summary
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    task_uuid, version, task, status, priority, due_date, task_type, estimated_hours,
+                    operation_type, change_summary, due_day, created_day, board
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, {_SQL_DAY_NOW}, ?)
             ''', (
-                task_uuid, 1, task, priority, due_date, task_type, estimated_hours,
-                'create', f'Created task: {task[:50]}'
+                task_uuid, version, values['task'], values['status'], values['priority'], values['due_date'],
+                values['task_type'], values['estimated_hours'], operation_type, change_summary,
+                _to_day_number(values['due_date']), board
             ))
-            conn.commit()
+            record_id = cursor.lastrowid
+            # 同一事务内维护 LSH 桶索引
+            if operation_type == 'delete':
+                cursor.execute('DELETE FROM todo_lsh WHERE task_uuid = ?', (task_uuid,))
+            elif operation_type == 'create' or 'task' in changes:
+                self._write_band_keys(cursor, board, task_uuid, values['task'])
+            cursor.execute(f'SELECT {_RECORD_COLUMNS} FROM todo_unified u WHERE u.id = ?', (record_id,))
+            return TaskRecord._make(cursor.fetchone())
+        
+        return self.run_write(write_version, board)
+    
+    def get_latest(self, board, task_uuid):
+        with self.connect() as conn:
+            row = conn.execute(f'''
+                SELECT {_RECORD_COLUMNS} FROM todo_unified u
+                WHERE u.board = ? AND u.task_uuid = ?
+                ORDER BY u.version DESC LIMIT 1
+            ''', (board, task_uuid)).fetchone()
+        return TaskRecord._make(row) if row else None
+    
+    def iter_current(self, board, query=TaskQuery()):
+        conditions = ['u.board = ?', _LATEST_VERSION_SQL, "u.operation_type != 'delete'"]
+        params = [board]
+        for condition, value in (('u.task_uuid = ?', query.task_uuid), ('u.status = ?', query.status),
+                                 ('u.due_day >= ?', query.due_from), ('u.due_day <= ?', query.due_to)):
+            if value is not None:
+                conditions.append(condition)
+                params.append(value)
+        if query.open_only:
+            conditions.append("u.status != 'completed'")
+        if query.keyword:
+            conditions.append('u.task LIKE ?')
+            params.append(f'%{query.keyword}%')
+        
+        # 智能评分函数 (连接上注册的 UDF)，today 以整数常量传入保持函数确定性
+        today = _today_day_number() if query.today is None else query.today
+        smart_args = f'u.priority, u.due_day, u.task_type, u.estimated_hours, {int(today)}'
+        if query.quadrant:
+            conditions.append(f'smart_quadrant({smart_args}) = ?')
+            params.append(query.quadrant.upper())
+        order_by = self.ORDER_BY[query.order_by]
+        limit_sql = ''
+        if query.top is not None:
+            order_by = f'smart_weight({smart_args}) DESC, {order_by}'
+            limit_sql = f'LIMIT {int(query.top)}'
+        
+        conn = self.connect()
+        try:
+            cursor = conn.execute(f'''
+                SELECT {_RECORD_COLUMNS}
+                FROM todo_unified u
+                WHERE {' AND '.join(conditions)}
+                ORDER BY {order_by}
+                {limit_sql}
+            ''', params)
+            yield from map(TaskRecord._make, cursor)
+        finally:
+            conn.close()
+    
+    def history(self, board, task_uuid):
+        with self.connect() as conn:
+            rows = conn.execute(f'''
+                SELECT {_RECORD_COLUMNS} FROM todo_unified u
+                WHERE u.board = ? AND u.task_uuid = ?
+                ORDER BY u.version DESC
+            ''', (board, task_uuid)).fetchall()
+        return [TaskRecord._make(row) for row in rows]
+    
+    def bulk_load(self, records, templates=()):
+        columns = TaskRecord._fields[1:]
+        insert_sql = f'''
+            INSERT INTO todo_unified ({', '.join(columns)})
+            VALUES ({', '.join('?' for _ in columns)})
+        '''
+        
+        # 单个写事务 (版本记录与模板一起提交)；重复的 task_uuid + version 会被唯一约束拒绝并跳过
+        def load_records(cursor):
+            loaded = 0
+            skipped = []
+            boards = set()
+            newest = {}
+            for record in records:
+                try:
+                    cursor.execute(insert_sql, record[1:])
+                except sqlite3.Error as e:
+                    skipped.append((record.task_uuid, e))
+                    continue
+                loaded += 1
+                boards.add(record.board)
+                current = newest.get(record.task_uuid)
+                if current is None or current.version < record.version:
+                    newest[record.task_uuid] = record
+            for template in templates:
+                self._write_template(cursor, template)
+                boards.add(template.board)
+            for board in boards:
+                self._check_board_writable(cursor, board)
+            cursor.executemany('INSERT OR IGNORE INTO todo_boards (board, owner) VALUES (?, ?)',
+                               [(board, self.owner) for board in boards])
+            # 载入的最新版本进入 LSH 桶索引
+            for record in newest.values():
+                if record.operation_type == 'delete':
+                    cursor.execute('DELETE FROM todo_lsh WHERE task_uuid = ?', (record.task_uuid,))
+                else:
+                    self._write_band_keys(cursor, record.board, record.task_uuid, record.task)
+            return loaded, skipped
+        
+        return self.run_write(load_records)
+    
+    def iter_records(self, board=None):
+        conn = self.connect()
+        try:
+            where, params = ('WHERE u.board = ?', (board,)) if board else ('', ())
+            cursor = conn.execute(f'SELECT {_RECORD_COLUMNS} FROM todo_unified u {where} ORDER BY u.created_at, u.id', params)
+            yield from map(TaskRecord._make, cursor)
+        finally:
+            conn.close()
+    
+    def similar_candidates(self, board, band_keys):
+        if not band_keys:
+            return set()
+        with self.connect() as conn:
+            rows = conn.execute(f'''
+                SELECT DISTINCT task_uuid FROM todo_lsh
+                WHERE board = ? AND band_key IN ({', '.join('?' for _ in band_keys)})
+            ''', [board] + list(band_keys)).fetchall()
+        return {row[0] for row in rows}
+    
+    def reindex_similarity(self, board, entries):
+        # 只改写与现有索引不一致的任务 (首次运行即回填，之后通常无需写入)
+        wanted = {task_uuid: set(band_keys) for task_uuid, band_keys in entries}
+        
+        def write_index(cursor):
+            indexed = {}
+            for task_uuid, key in cursor.execute('SELECT task_uuid, band_key FROM todo_lsh WHERE board = ?', (board,)):
+                indexed.setdefault(task_uuid, set()).add(key)
+            stale = [task_uuid for task_uuid, keys in indexed.items() if wanted.get(task_uuid) != keys]
+            missing = [task_uuid for task_uuid, keys in wanted.items() if indexed.get(task_uuid) != keys]
+            cursor.executemany('DELETE FROM todo_lsh WHERE task_uuid = ?', [(task_uuid,) for task_uuid in stale])
+            cursor.executemany('INSERT INTO todo_lsh (board, band_key, task_uuid) VALUES (?, ?, ?)',
+                               ((board, key, task_uuid) for task_uuid in missing for key in wanted[task_uuid]))
+        
+        self.run_write(write_index)
+    
+    def save_template(self, template):
+        def write_template(cursor):
+            cursor.execute('INSERT OR IGNORE INTO todo_boards (board, owner) VALUES (?, ?)',
+                           (template.board, self.owner))
+            self._write_template(cursor, template)
+        
+        self.run_write(write_template, template.board)
+    
+    def _write_template(self, cursor, template: RecurringTemplate):
+        cursor.execute(f'''
+            INSERT OR REPLACE INTO todo_recurring ({', '.join(RecurringTemplate._fields)})
+            VALUES ({', '.join('COALESCE(?, CURRENT_TIMESTAMP)' if field == 'created_at' else '?'
+                               for field in RecurringTemplate._fields)})
+        ''', template.to_row())
+    
+    def iter_templates(self, board, active_only=True):
+        with self.connect() as conn:
+            rows = conn.execute(f'''
+                SELECT {', '.join(RecurringTemplate._fields)} FROM todo_recurring
+                WHERE board = ? {'AND active = 1' if active_only else ''}
+                ORDER BY created_at, template_uuid
+            ''', (board,)).fetchall()
+        return map(RecurringTemplate.from_row, rows)
+    
+    def existing_uuids(self, board, task_uuids):
+        task_uuids = list(task_uuids)
+        found = set()
+        with self.connect() as conn:
+            # 分批 IN 查询，走 (board, task_uuid, version) 或 (task_uuid, version) 索引
+            board_sql, board_params = ('board = ? AND', [board]) if board is not None else ('', [])
+            for start in range(0, len(task_uuids), 500):
+                chunk = task_uuids[start:start + 500]
+                found.update(row[0] for row in conn.execute(f'''
+                    SELECT DISTINCT task_uuid FROM todo_unified
+                    WHERE {board_sql} task_uuid IN ({', '.join('?' for _ in chunk)})
+                ''', board_params + chunk))
+        return found
+    
+    def _write_band_keys(self, cursor, board: str, task_uuid: str, text: str):
+        cursor.execute('DELETE FROM todo_lsh WHERE task_uuid = ?', (task_uuid,))
+        cursor.executemany('INSERT INTO todo_lsh (board, band_key, task_uuid) VALUES (?, ?, ?)',
+                           [(board, key, task_uuid) for key in _task_band_keys(text)])
+    
+    def storage_stats(self, conn: sqlite3.Connection, detail: bool = True) -> Dict[str, Any]:
+        """页数、空闲页、文件大小；detail 时用 dbstat 统计各表/索引页内未用空间 (未编译 dbstat 时省略)"""
+        page_size = conn.execute('PRAGMA page_size').fetchone()[0]
+        page_count = conn.execute('PRAGMA page_count').fetchone()[0]
+        freelist = conn.execute('PRAGMA freelist_count').fetchone()[0]
+        wal_path = f"{self.db_path}-wal"
+        stats = {
+            'page_size': page_size,
+            'page_count': page_count,
+            'freelist_count': freelist,
+            'free_ratio': round(freelist / page_count, 4) if page_count else 0.0,
+            'file_bytes': page_size * page_count,
+            'wal_bytes': os.path.getsize(wal_path) if os.path.exists(wal_path) else 0,
+            'auto_vacuum': ('none', 'full', 'incremental')[conn.execute('PRAGMA auto_vacuum').fetchone()[0]],
+        }
+        if detail:
+            try:
+                rows = conn.execute('''
+                    SELECT name, COUNT(*), SUM(unused), SUM(pgsize) FROM dbstat GROUP BY name ORDER BY COUNT(*) DESC
+                ''').fetchall()
+            except sqlite3.OperationalError:
+                rows = None
+            if rows:
+                stats['unused_ratio'] = round(sum(row[2] for row in rows) / sum(row[3] for row in rows), 4)
+                stats['objects'] = {name: {'pages': pages, 'unused_ratio': round(unused / size, 4)}
+                                    for name, pages, unused, size in rows}
+        return stats
+    
+    def maintain(self, max_steps: Optional[int] = None, step_pages: int = _MAINTAIN_STEP_PAGES,
+                 full: bool = True) -> Dict[str, Any]:
+        """数据库维护: 更新规划器统计信息、增量回收空闲页、截断 WAL、快速完整性检查
+        
+        full: 完整维护 (ANALYZE、必要时一次性 VACUUM 切换到 auto_vacuum=INCREMENTAL、
+              quick_check 和碎片统计)；为 False 时是自动模式的轻量维护: 只做 PRAGMA optimize、
+              一步增量回收和不等待读者的 WAL 检查点
+        max_steps: 增量回收最多执行的步数 (每步 step_pages 页、一个短事务)，None 为回收完为止
+        返回维护前后的存储统计和各步骤耗时。
+        """
+        started = time.monotonic()
+        conn = self.connect()
+        conn.isolation_level = None
+        steps = []
+        
+        def run_step(name: str, action):
+            step_started = time.monotonic()
+            detail = action()
+            steps.append({'step': name, 'seconds': round(time.monotonic() - step_started, 3), 'detail': detail})
+        
+        try:
+            if not full:
+                # 轻量维护不应让触发它的写入长时间等待
+                conn.execute('PRAGMA busy_timeout = 50')
+                max_steps = 1
+            before = self.storage_stats(conn, detail=full)
+            
+            def analyze():
+                conn.execute(f'PRAGMA analysis_limit = {_ANALYZE_LIMIT}')
+                has_stats = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'").fetchone()
+                if full or not has_stats:
+                    conn.execute('ANALYZE')
+                    return 'ANALYZE'
+                conn.execute('PRAGMA optimize')
+                return 'PRAGMA optimize'
+            
+            run_step('统计信息', analyze)
+            
+            if full and before['auto_vacuum'] != 'incremental':
+                def switch_auto_vacuum():
+                    # 已有数据库切换 auto_vacuum 需要一次完整 VACUUM (同时整理碎片)
+                    conn.execute('PRAGMA auto_vacuum = INCREMENTAL')
+                    conn.execute('VACUUM')
+                    return f"{before['auto_vacuum']} → incremental (一次性 VACUUM)"
+                
+                run_step('切换 auto_vacuum', switch_auto_vacuum)
+            
+            def incremental_vacuum():
+                if conn.execute('PRAGMA auto_vacuum').fetchone()[0] != 2:
+                    return '跳过 (auto_vacuum 不是 incremental，请运行一次完整 maintain)'
+                reclaimed = count = 0
+                while max_steps is None or count < max_steps:
+                    free = conn.execute('PRAGMA freelist_count').fetchone()[0]
+                    if not free:
+                        break
+                    # executescript 把语句执行到底 (execute 对无结果列的 PRAGMA 只执行一步，只释放一页)
+                    conn.executescript(f'PRAGMA incremental_vacuum({min(free, step_pages)});')
+                    reclaimed += free - conn.execute('PRAGMA freelist_count').fetchone()[0]
+                    count += 1
+                return f"{count} 步，回收 {reclaimed} 页"
+            
+            run_step('增量回收', incremental_vacuum)
+            
+            checkpoint_mode = 'TRUNCATE' if full else 'PASSIVE'
+            
+            def checkpoint():
+                busy, log_frames, checkpointed = conn.execute(f'PRAGMA wal_checkpoint({checkpoint_mode})').fetchone()
+                if busy:
+                    return f"有其他连接占用，写回 {checkpointed}/{log_frames} 帧"
+                return f"写回 {checkpointed} 帧"
+            
+            run_step(f'WAL 检查点 ({checkpoint_mode})', checkpoint)
+            
+            if full:
+                def quick_check():
+                    problems = [row[0] for row in conn.execute('PRAGMA quick_check')]
+                    return 'ok' if problems == ['ok'] else '; '.join(problems[:10])
+                
+                run_step('快速完整性检查', quick_check)
+            
+            written = conn.execute("SELECT value FROM todo_meta WHERE key = 'write_counter'").fetchone()[0]
+            after = self.storage_stats(conn, detail=full)
+        finally:
+            conn.close()
+        self._save_maintenance_state(int(written))
+        
+        return {'full': full, 'steps': steps, 'before': before, 'after': after,
+                'seconds': round(time.monotonic() - started, 3)}
+    
+    def maintenance_state(self) -> Dict[str, Any]:
+        """上次维护的位置 {'maintained_counter': write_counter, 'maintained_at': UTC 时间}，从未维护时为空"""
+        try:
+            with open(self._maintain_state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            return state if isinstance(state, dict) else {}
+        except (OSError, ValueError):
+            return {}
+    
+    def _save_maintenance_state(self, written: int):
+        """维护位置写在数据库之外: 写 todo_meta 会改变 PRAGMA data_version，使内存读缓存和 watch 无谓地失效"""
+        self._maintained_counter = written
+        state = {'maintained_counter': written,
+                 'maintained_at': datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')}
+        temp_path = f"{self._maintain_state_path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+            os.replace(temp_path, self._maintain_state_path)
+        except OSError:
+            # 记录失败只会让下次自动维护提前
+            pass
+    
+    def _writes_since_maintenance(self, written: int) -> int:
+        """距上次维护的写事务数；快到阈值时重新读取记录，感知其他进程做过的维护"""
+        if self._maintained_counter is None or written - self._maintained_counter >= _AUTO_MAINTAIN_WRITES:
+            counter = self.maintenance_state().get('maintained_counter', 0)
+            self._maintained_counter = counter if isinstance(counter, int) and counter <= written else 0
+        return written - self._maintained_counter
+    
+    def _auto_maintain(self):
+        """写事务提交后触发的轻量维护；失败不影响写入本身"""
+        self._maintenance_due = False
+        try:
+            self.maintain(full=False)
+        except sqlite3.Error:
+            pass
+
+
+class MemoryTaskStore(TaskStore):
+    """纯内存存储引擎: 用于一次性运行、缓存和测试，无文件 I/O
+    
+    索引结构:
+      _versions: (board, task_uuid) -> 按版本升序的记录列表
+      _latest:   board -> {task_uuid: 最新版本记录}
+      _by_status: board -> {status: task_uuid 集合}
+      _due_heaps: board -> 以 (due_day, id, task_uuid) 为键的最小堆，过期条目惰性跳过
+      _lsh:      board -> LSHIndex，近似重复检测的桶索引 (按需建立)
+      _templates: board -> {template_uuid: RecurringTemplate}
+    可用 load() 从 SQLite 数据库载入快照，运行后用 persist() 一次写回新增的版本。
+    """
+    
+    def __init__(self, rules: Optional[ScoringRules] = None):
+        self.rules = rules or ScoringRules.load(os.environ.get('TODO_SCORING_RULES'))
+        self._versions = {}
+        self._latest = {}
+        self._by_status = {}
+        self._due_heaps = {}
+        self._next_id = 1
+        self._dirty = []        # 载入快照后新追加、尚未写回的记录
+        self._lsh = {}          # board -> LSHIndex (首次查询相似任务时建立)
+        self._templates = {}
+        self._dirty_templates = []
+        self.source_path = None
+    
+    @classmethod
+    def load(cls, db_path: str, board: Optional[str] = None,
+             rules: Optional[ScoringRules] = None) -> 'MemoryTaskStore':
+        """从 SQLite 数据库载入快照 (board 为 None 时载入全部看板)
+        
+        经由 SQLiteTaskStore 打开，旧版本的数据库先完成迁移；文件不存在时报错而不是新建空库。
+        """
+        if not os.path.exists(db_path):
+            raise FileNotFoundError(f"数据库不存在: {db_path}")
+        store = cls(rules)
+        conn = SQLiteTaskStore(db_path, store.rules).connect()
+        try:
+            where, params = ('WHERE u.board = ?', (board,)) if board else ('', ())
+            for row in conn.execute(f'SELECT {_RECORD_COLUMNS} FROM todo_unified u {where} ORDER BY u.id', params):
+                store._add(TaskRecord._make(row))
+            rows = conn.execute(f'''
+                SELECT {', '.join(RecurringTemplate._fields)} FROM todo_recurring {where.replace('u.', '')}
+            ''', params).fetchall()
+            for template in map(RecurringTemplate.from_row, rows):
+                store._templates.setdefault(template.board, {})[template.template_uuid] = template
+        finally:
+            conn.close()
+        store.source_path = db_path
+        return store
+    
+    def persist(self, db_path: Optional[str] = None) -> tuple:
+        """把载入后新追加的版本和模板一次性写回 SQLite 数据库 (单个写事务)，返回 (写入数, 跳过记录)
+        
+        db_path 默认为 load() 的来源数据库；直接构造的内存引擎必须指定。
+        """
+        db_path = db_path or self.source_path
+        if db_path is None:
+            raise ValueError("内存存储引擎不是从数据库载入的，persist() 需要指定目标数据库路径")
+        result = SQLiteTaskStore(db_path, self.rules).bulk_load(self._dirty, self._dirty_templates)
+        self._dirty = []
+        self._dirty_templates = []
+        return result
+    
+    def append_version(self, board, task_uuid, changes, operation_type, change_summary):
+        current = self._latest.get(board, {}).get(task_uuid)
+        if operation_type == 'create':
+            values, version = dict(_NEW_TASK_DEFAULTS), 1
+        elif current is None:
+            return None
+        else:
+            values = {field: getattr(current, field) for field in _NEW_TASK_DEFAULTS}
+            values['task_type'] = values['task_type'] or 'general'
+            values['estimated_hours'] = values['estimated_hours'] or 0
+            version = current.version + 1
+        values.update(changes)
+        
+        # 与 SQLite 的 CURRENT_TIMESTAMP 一致使用 UTC
+        now = datetime.now(timezone.utc)
+        timestamp = now.strftime('%Y-%m-%d %H:%M:%S')
+        record = TaskRecord(
+            self._next_id, task_uuid, version, values['task'], values['status'], values['priority'],
+            values['due_date'], values['task_type'], values['estimated_hours'], operation_type, change_summary,
+            timestamp, timestamp, _to_day_number(values['due_date']), (now.date() - _EPOCH_DATE).days, board
+        )
+        self._add(record)
+        self._dirty.append(record)
+        return record
+    
+    def get_latest(self, board, task_uuid):
+        return self._latest.get(board, {}).get(task_uuid)
+    
+    def iter_current(self, board, query=TaskQuery()):
+        latest = self._latest.get(board, {})
+        # 选择最窄的索引取候选集
+        if query.task_uuid is not None:
+            candidates = [latest[query.task_uuid]] if query.task_uuid in latest else []
+        elif query.due_to is not None:
+            candidates = self._due_range(board, query.due_from, query.due_to)
+        elif query.status is not None:
+            candidates = [latest[task_uuid] for task_uuid in self._by_status.get(board, {}).get(query.status, ())]
+        else:
+            candidates = latest.values()
+        
+        keyword = query.keyword.lower() if query.keyword else None
+        today = _today_day_number() if query.today is None else query.today
+        rules = self.rules
+        quadrant = query.quadrant.upper() if query.quadrant else None
+        rows = []
+        for record in candidates:
+            if record.operation_type == 'delete':
+                continue
+            if query.status is not None and record.status != query.status:
+                continue
+            if query.open_only and record.status == 'completed':
+                continue
+            if query.due_from is not None and (record.due_day is None or record.due_day < query.due_from):
+                continue
+            if query.due_to is not None and (record.due_day is None or record.due_day > query.due_to):
+                continue
+            if keyword and keyword not in record.task.lower():
+                continue
+            if quadrant and rules.smart_quadrant(record.priority, record.due_day, record.task_type,
+                                                 record.estimated_hours, today) != quadrant:
+                continue
+            rows.append(record)
+        
+        if query.order_by == 'created':
+            rows.sort(key=lambda record: (record.created_at or '', record.id), reverse=True)
+        elif query.order_by == 'due':
+            rows.sort(key=lambda record: (record.due_day, record.id))
+        else:
+            rows.sort(key=lambda record: record.id)
+        if query.top is not None:
+            # 堆选前 N 个，同权重保持原排序
+            ranked = heapq.nsmallest(query.top, enumerate(rows), key=lambda item: (
+                -rules.smart_weight(item[1].priority, item[1].due_day, item[1].task_type,
+                                    item[1].estimated_hours, today), item[0]))
+            rows = [record for _, record in ranked]
+        return iter(rows)
+    
+    def history(self, board, task_uuid):
+        return list(reversed(self._versions.get((board, task_uuid), [])))
+    
+    def bulk_load(self, records, templates=()):
+        for template in templates:
+            self.save_template(template)
+        loaded = 0
+        skipped = []
+        for record in records:
+            if record.id is None or record.id < self._next_id:
+                record = record._replace(id=self._next_id)
+            try:
+                self._add(record)
+            except ValueError as e:
+                skipped.append((record.task_uuid, e))
+                continue
+            self._dirty.append(record)
+            loaded += 1
+        return loaded, skipped
+    
+    def iter_records(self, board=None):
+        records = [record for (record_board, _), versions in self._versions.items()
+                   if board is None or record_board == board for record in versions]
+        records.sort(key=lambda record: (record.created_at or '', record.id))
+        return iter(records)
+    
+    def save_template(self, template):
+        if template.created_at is None:
+            template = template._replace(created_at=datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S'))
+        self._templates.setdefault(template.board, {})[template.template_uuid] = template
+        self._dirty_templates.append(template)
+    
+    def iter_templates(self, board, active_only=True):
+        templates = sorted(self._templates.get(board, {}).values(),
+                           key=lambda template: (template.created_at or '', template.template_uuid))
+        return iter([template for template in templates if template.active or not active_only])
+    
+    def existing_uuids(self, board, task_uuids):
+        if board is None:
+            stored = {task_uuid for _, task_uuid in self._versions}
+            return {task_uuid for task_uuid in task_uuids if task_uuid in stored}
+        return {task_uuid for task_uuid in task_uuids if (board, task_uuid) in self._versions}
+    
+    def similar_candidates(self, board, band_keys):
+        index = self._lsh.get(board)
+        if index is None:
+            index = self._lsh[board] = LSHIndex()
+            for record in self._latest.get(board, {}).values():
+                if record.operation_type != 'delete':
+                    index.add(record.task_uuid, _task_band_keys(record.task))
+        return index.candidates(band_keys)
+    
+    def reindex_similarity(self, board, entries):
+        index = self._lsh[board] = LSHIndex()
+        for task_uuid, band_keys in entries:
+            index.add(task_uuid, band_keys)
+    
+    def _add(self, record: TaskRecord):
+        """把一条记录加入各索引"""
+        key = (record.board, record.task_uuid)
+        versions = self._versions.setdefault(key, [])
+        if any(existing.version == record.version for existing in versions):
+            raise ValueError(f"UNIQUE constraint failed: task_uuid, version ({record.task_uuid}, v{record.version})")
+        versions.append(record)
+        if len(versions) > 1 and versions[-2].version > record.version:
+            versions.sort(key=lambda existing: existing.version)
+        self._next_id = max(self._next_id, record.id + 1)
+        
+        latest = self._latest.setdefault(record.board, {})
+        current = latest.get(record.task_uuid)
+        if current is not None and current.version > record.version:
+            return
+        statuses = self._by_status.setdefault(record.board, {})
+        if current is not None:
+            statuses[current.status].discard(record.task_uuid)
+        statuses.setdefault(record.status, set()).add(record.task_uuid)
+        latest[record.task_uuid] = record
+        
+        index = self._lsh.get(record.board)
+        if index is not None:
+            if record.operation_type == 'delete':
+                index.remove(record.task_uuid)
+            elif current is None or current.operation_type == 'delete' or current.task != record.task:
+                index.add(record.task_uuid, _task_band_keys(record.task))
+        
+        if record.due_day is not None:
+            heap = self._due_heaps.setdefault(record.board, [])
+            heapq.heappush(heap, (record.due_day, record.id, record.task_uuid))
+            if len(heap) > 2 * len(latest) + 64:
+                # 过期条目过多时重建
+                heap[:] = [(r.due_day, r.id, r.task_uuid) for r in latest.values() if r.due_day is not None]
+                heapq.heapify(heap)
+    
+    def _due_range(self, board: str, due_from: Optional[int], due_to: int) -> List[TaskRecord]:
+        """在截止日期最小堆上做范围查找: 节点超过上界时整棵子树剪枝"""
+        heap = self._due_heaps.get(board, [])
+        latest = self._latest.get(board, {})
+        result = []
+        stack = [0] if heap else []
+        while stack:
+            index = stack.pop()
+            due_day, record_id, task_uuid = heap[index]
+            if due_day > due_to:
+                continue
+            record = latest.get(task_uuid)
+            if (due_from is None or due_day >= due_from) and record is not None and record.id == record_id:
+                result.append(record)
+            stack.extend(child for child in (2 * index + 1, 2 * index + 2) if child < len(heap))
+        return result
+
+
+class EscalationEvent(NamedTuple):
+    """任务跨入更高时间压力档位的事件"""
+    task_uuid: str
+    task: str
+    day: int                # 跨越发生的日期 (整数天数)
+    from_level: float       # 时间压力展示信息键 (time_pressure_levels 的键)
+    to_level: float
+    from_priority: str      # 跨越前后的智能优先级
+    to_priority: str
+    weight: float           # 跨越后的动态权重
+    
+    @property
+    def date(self) -> str:
+        return _from_day_number(self.day)
+    
+    @property
+    def quadrant_changed(self) -> bool:
+        return self.from_priority != self.to_priority
+
+
+class EscalationScheduler:
+    """截止日期升级调度器: 最小堆保存每个任务下一次跨越时间压力档位的日期
+    
+    advance() 只弹出已到期的堆顶条目，不对全部任务重新评分；track() 在任务创建、更新、
+    删除时增量调整该任务的条目 (旧条目按序号惰性失效)。
+    """
+    
+    def __init__(self, rules: ScoringRules, today: Optional[int] = None):
+        self.rules = rules
+        self.today = _today_day_number() if today is None else today
+        self._heap = []         # (跨越日期, 序号, task_uuid)
+        self._tasks = {}        # task_uuid -> (序号, 版本, 记录, 跨越日期)
+        self._hooks = []
+        self._seq = 0
+    
+    def subscribe(self, callback):
+        """注册回调 callback(event)，每个升级事件调用一次"""
+        self._hooks.append(callback)
+    
+    def load(self, records):
+        """批量建堆 (records 通常来自截止日期索引的范围扫描)"""
+        for record in records:
+            self._track(record, push=False)
+        heapq.heapify(self._heap)
+    
+    def track(self, record: TaskRecord):
+        """任务有新版本时增量更新其下一次跨越日期"""
+        self._track(record, push=True)
+    
+    def advance(self, today: Optional[int] = None) -> List[EscalationEvent]:
+        """推进到 today，按时间顺序返回期间发生的升级事件并通知回调"""
+        today = _today_day_number() if today is None else today
+        events = []
+        while self._heap and self._heap[0][0] <= today:
+            day, seq, task_uuid = heapq.heappop(self._heap)
+            entry = self._tasks.get(task_uuid)
+            if entry is None or entry[0] != seq:
+                continue
+            record = entry[2]
+            events.append(self._event(record, day))
+            self._schedule(record, day, entry[1])
+        self.today = max(self.today, today)
+        for event in events:
+            for callback in self._hooks:
+                callback(event)
+        return events
+    
+    def __len__(self) -> int:
+        return len(self._tasks)
+    
+    def _track(self, record, push: bool):
+        current = self._tasks.get(record.task_uuid)
+        if current is not None and current[1] > record.version:
+            return
+        if record.operation_type == 'delete' or record.status == 'completed' or record.due_day is None:
+            self._tasks.pop(record.task_uuid, None)
+            return
+        self._schedule(record, self.today, record.version, push)
+    
+    def _schedule(self, record, after_day: int, version: int, push: bool = True):
+        next_day = self.rules.next_escalation_day(record.due_day, after_day)
+        if next_day is None:
+            self._tasks.pop(record.task_uuid, None)
+            return
+        self._seq += 1
+        self._tasks[record.task_uuid] = (self._seq, version, record, next_day)
+        item = (next_day, self._seq, record.task_uuid)
+        if not push:
+            self._heap.append(item)
+        elif len(self._heap) > 2 * len(self._tasks) + 64:
+            # 失效条目过多时按当前条目重建
+            self._heap = [(entry[3], entry[0], task_uuid) for task_uuid, entry in self._tasks.items()]
+            heapq.heapify(self._heap)
+        else:
+            heapq.heappush(self._heap, item)
+    
+    def _event(self, record, day: int) -> EscalationEvent:
+        rules = self.rules
+        args = (record.priority, record.due_day, record.task_type, record.estimated_hours)
+        before = rules.dynamic_weight(*args, day - 1)
+        after = rules.dynamic_weight(*args, day)
+        return EscalationEvent(
+            record.task_uuid, record.task, day,
+            rules.time_pressure(record.due_day, day - 1)[1], rules.time_pressure(record.due_day, day)[1],
+            rules.final_priority(before), rules.final_priority(after), round(after, 1)
+        )
+
+
+def _cached_output(command: str):
+    """读命令装饰器: 启用读缓存时，按命令、参数和当天日期复用渲染输出"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if self.read_cache is None:
+                return method(self, *args, **kwargs)
+            key = json.dumps([command, self.board, args, sorted(kwargs.items()), date.today().isoformat(),
+                              self.rules.fingerprint],
+                             ensure_ascii=False, default=str)
+            return self._cached_read(key, lambda: method(self, *args, **kwargs))
+        return wrapper
+    return decorator
+
+
+class TodoManager:
+    def __init__(self, db_path: str = "/Users/cloudv/Desktop/todo-sqlite/simple.db",
+                 busy_timeout: float = 5.0, max_retries: int = 5, retry_backoff: float = 0.05,
+                 read_cache: Optional[str] = None, cache_size: int = 64,
+                 scoring_rules: Optional[str] = None, board: str = 'default', owner: Optional[str] = None,
+                 store: Optional[TaskStore] = None, auto_maintain: Optional[bool] = None):
+        """初始化任务管理器
+        
+        busy_timeout: 等待其他进程释放写锁的秒数
+        max_retries: 写事务遇到锁冲突或版本冲突时的最大重试次数
+        retry_backoff: 重试的基础退避秒数 (指数增长并加随机抖动)
+        read_cache: 读命令结果缓存 - None 不缓存, 'memory' 进程内缓存, 'disk' 数据库旁的缓存文件
+        cache_size: 读缓存最多保留的条目数
+        scoring_rules: 评分规则 JSON 文件路径，默认读取环境变量 TODO_SCORING_RULES
+        board: 当前看板 (团队/项目)，所有读写只作用于该看板
+        owner: 看板负责人，首次在看板中创建任务时登记
+        store: 自定义存储引擎 (如 MemoryTaskStore)，默认使用 db_path 上的 SQLite；评分规则取自引擎
+               (在构造引擎时传入，不能再指定 scoring_rules)；非 SQLite 引擎下统计、批量操作、
+               watch、看板管理、维护和读缓存不可用
+        auto_maintain: 每累计 _AUTO_MAINTAIN_WRITES 次写事务后自动做一次轻量维护，
+                       默认读取环境变量 TODO_AUTO_MAINTAIN (1/true 开启)
+        """
+        self._listeners = []
+        self.board = board
+        self.owner = owner
+        if store is None:
+            if auto_maintain is None:
+                auto_maintain = os.environ.get('TODO_AUTO_MAINTAIN', '').lower() in ('1', 'true', 'yes')
+            store = SQLiteTaskStore(db_path, ScoringRules.load(scoring_rules or os.environ.get('TODO_SCORING_RULES')),
+                                    owner, busy_timeout, max_retries, retry_backoff, auto_maintain)
+        elif scoring_rules:
+            raise ValueError("使用自定义存储引擎时，评分规则在构造引擎时传入")
+        self.store = store
+        self.rules = store.rules
+        self.db_path = store.db_path if isinstance(store, SQLiteTaskStore) else None
+        self.setup_enhanced_priority_system()
+        
+        # 读缓存: 内存模式常驻一个连接，用 PRAGMA data_version 感知其他连接的提交
+        self.read_cache = None
+        self._token_conn = None
+        if self.db_path is None:
+            pass
+        elif read_cache == 'memory':
+            self.read_cache = ReadCache(max_entries=cache_size)
+            self._token_conn = self._connect()
+        elif read_cache == 'disk':
+            self.read_cache = ReadCache(max_entries=cache_size, path=f"{self.db_path}.readcache.json")
+    
+    def setup_enhanced_priority_system(self):
+        """设置增强的优先级系统"""
+        # 艾森豪威尔矩阵定义 (模块级共享只读数据)
+        self.eisenhower_matrix = _EISENHOWER_MATRIX
+        
+        # 重置颜色
+        self.reset_color = '\033[0m'
+        
+        # 时间压力说明
+        self.time_pressure_levels = _TIME_PRESSURE_LEVELS
+    
+    def init_database(self):
+        """初始化数据库表结构 (SQLite 引擎构造时已执行)"""
+        self._sqlite_store().init_database()
+    
+    def _sqlite_store(self) -> SQLiteTaskStore:
+        """依赖 SQL 的功能使用的 SQLite 引擎"""
+        if not isinstance(self.store, SQLiteTaskStore):
+            raise RuntimeError(f"当前存储引擎 {type(self.store).__name__} 不支持该功能，需要 SQLite 数据库")
+        return self.store
+    
+    def _connect(self) -> sqlite3.Connection:
+        """打开数据库连接 (带 busy_timeout)"""
+        return self._sqlite_store().connect()
+    
+    def _run_write(self, operation, check_board: bool = True):
+        """在引擎的写事务中执行 operation(cursor)，冲突时自动重试
+        
+        check_board: 先确认当前看板未归档 (看板管理操作本身传 False)
+        """
+        return self._sqlite_store().run_write(operation, self.board if check_board else None)
+    
+    def _data_token(self) -> str:
+        """当前数据版本令牌: 任何写入后都会变化"""
+        if self._token_conn is not None:
+            data_version = self._token_conn.execute('PRAGMA data_version').fetchone()[0]
+            return f"dv:{data_version}"
+        with self._connect() as conn:
+            counter, max_id = conn.execute('''
+                SELECT (SELECT value FROM todo_meta WHERE key = 'write_counter'),
+                       (SELECT MAX(id) FROM todo_unified)
+            ''').fetchone()
+        # MAX(id) 兼顾绕过本程序直接追加记录的写入者
+        return f"wc:{counter}:{max_id}"
+    
+    def _cached_read(self, key: str, render):
+        """命中时直接输出缓存，未命中时执行 render 并捕获其输出"""
+        token = self._data_token()
+        output = self.read_cache.get(key, token)
+        if output is None:
+            buffer = io.StringIO()
+            with redirect_stdout(buffer):
+                render()
+            output = buffer.getvalue()
+            self.read_cache.put(key, token, output)
+        sys.stdout.write(output)
+    
+    def add_listener(self, callback):
+        """注册版本写入监听 callback(record)，本实例的 create/update/delete 写入后调用
+        
+        批量操作和其他进程的写入不会触发，需要时由 watch 等轮询模式感知。
+        """
+        self._listeners.append(callback)
+    
+    def remove_listener(self, callback):
+        """取消 add_listener 注册的监听 (未注册时忽略)"""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+    
+    def _notify(self, record: Optional[TaskRecord]):
+        if record is not None:
+            for callback in self._listeners:
+                callback(record)
+    
+    def get_write_stats(self) -> Dict[str, Any]:
+        """返回并发写入统计 (锁等待、锁超时、版本冲突、重试次数)，非 SQLite 引擎返回空字典"""
+        return dict(self.store.write_stats) if isinstance(self.store, SQLiteTaskStore) else {}
+    
+    def create_task(self, task: str, priority: str = 'normal', due_date: str = None, task_type: str = 'general', estimated_hours: float = 0,
+                    check_duplicates: bool = False) -> str:
+        """创建新任务 (check_duplicates 为真时，已有近似重复的任务则不创建，返回已有任务的 UUID)"""
+        if check_duplicates:
+            duplicates = self.find_duplicates(task)
+            if duplicates:
+                existing, similarity = duplicates[0]
+                print(f"⚠️ 已有相似任务，未创建 (相似度 {similarity:.0%}):")
+                print(f"   UUID: {existing.task_uuid}")
+                print(f"   任务: {existing.task}")
+                return existing.task_uuid
+        
+        task_uuid = str(uuid.uuid4())
+        
+        self._notify(self.store.append_version(self.board, task_uuid, {
+            'task': task, 'priority': priority, 'due_date': due_date,
+            'task_type': task_type, 'estimated_hours': estimated_hours,
+        }, 'create', f'Created task: {task[:50]}'))
         
         print(f"✅ 任务创建成功!")
         print(f"   UUID: {task_uuid}")
@@ -149,62 +2019,25 @@ class TodoManager:
     
     def update_task(self, task_uuid: str, field: str, value: str):
         """更新任务字段"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            # 获取当前任务信息
-            cursor.execute('''
-                SELECT task, status, priority, due_date, task_type, estimated_hours, version
-                FROM todo_unified 
-                WHERE task_uuid = ? 
-                ORDER BY version DESC LIMIT 1
-            ''', (task_uuid,))
-            
-            current = cursor.fetchone()
-            if not current:
-                print(f"❌ 未找到UUID为 {task_uuid} 的任务")
-                return
-            
-            current_task, current_status, current_priority, current_due_date, current_task_type, current_estimated_hours, current_version = current
-            
-            # 准备新版本的数据
-            new_task = current_task
-            new_status = current_status
-            new_priority = current_priority
-            new_due_date = current_due_date
-            new_task_type = current_task_type or 'general'
-            new_estimated_hours = current_estimated_hours or 0
-            
-            # 根据字段更新相应值
-            if field == 'task':
-                new_task = value
-            elif field == 'status':
-                new_status = value
-            elif field == 'priority':
-                new_priority = value
-            elif field == 'due_date':
-                new_due_date = value if value != 'null' else None
-            elif field == 'task_type':
-                new_task_type = value
-            elif field == 'estimated_hours':
-                new_estimated_hours = float(value)
-            else:
-                print(f"❌ 不支持的字段: {field}")
-                return
-            
-            # 插入新版本
-            cursor.execute('''
-                INSERT INTO todo_unified (
-                    task_uuid, version, task, status, priority, due_date, task_type, estimated_hours,
-                    operation_type, change_summary
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                task_uuid, current_version + 1, new_task, new_status, new_priority, 
-                new_due_date, new_task_type, new_estimated_hours,
-                'update', f'Updated {field}: {value}'
-            ))
-            
-            conn.commit()
+        if field not in _UPDATABLE_FIELDS:
+            print(f"❌ 不支持的字段: {field}")
+            return
+        
+        if field == 'due_date' and value == 'null':
+            new_value = None
+        elif field == 'estimated_hours':
+            new_value = float(value)
+        else:
+            new_value = value
+        
+        # 存储引擎在写事务内读取最新版本并写入 version + 1
+        record = self.store.append_version(self.board, task_uuid, {field: new_value}, 'update', f'Updated {field}: {value}')
+        if record is None and self._materialize_occurrence(task_uuid):
+            record = self.store.append_version(self.board, task_uuid, {field: new_value}, 'update', f'Updated {field}: {value}')
+        self._notify(record)
+        if record is None:
+            print(f"❌ 未找到UUID为 {task_uuid} 的任务")
+            return
         
         print(f"✅ 任务更新成功!")
         print(f"   字段: {field}")
@@ -212,346 +2045,828 @@ class TodoManager:
     
     def show_task(self, task_uuid: str):
         """显示任务详情和历史"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                SELECT version, task, status, priority, due_date, task_type, estimated_hours,
-                       operation_type, change_summary, created_at
-                FROM todo_unified 
-                WHERE task_uuid = ? 
-                ORDER BY version DESC
-            ''', (task_uuid,))
-            
-            versions = cursor.fetchall()
-            if not versions:
-                print(f"❌ 未找到UUID为 {task_uuid} 的任务")
-                return
-            
-            print(f"\n📋 任务详情: {task_uuid}")
-            print("=" * 70)
-            
-            # 显示最新版本
-            latest = versions[0]
-            version, task, status, priority, due_date, task_type, estimated_hours, operation_type, change_summary, created_at = latest
-            
-            print(f"📝 任务: {task}")
-            print(f"📊 状态: {status}")
-            print(f"⚡ 优先级: {priority}")
-            print(f"📅 截止日期: {due_date or '无'}")
-            print(f"🏷️ 类型: {task_type or 'general'}")
-            print(f"⏱️ 预估工时: {estimated_hours or 0}小时")
-            print(f"🕐 创建时间: {created_at}")
-            
-            # 显示智能优先级分析
-            priority_info = self.calculate_smart_priority(task_uuid)
-            if priority_info:
-                display = priority_info['display_info']
-                print(f"\n🎯 智能优先级分析:")
-                print(f"   动态权重: {priority_info['dynamic_weight']:.1f}/150")
-                print(f"   {display['action']}")
-                
-                if priority_info['time_pressure'] > 0:
-                    time_info = priority_info['time_pressure_info']
-                    print(f"   {time_info['color']} 时间压力: {time_info['level']} (+{priority_info['time_pressure']:.0f}%)")
-            
-            # 显示版本历史
-            if len(versions) > 1:
-                print(f"\n📚 版本历史 ({len(versions)} 个版本):")
-                print("─" * 70)
-                for version_data in versions:
-                    version, task, status, priority, due_date, task_type, estimated_hours, operation_type, change_summary, created_at = version_data
-                    print(f"v{version} | {operation_type} | {created_at} | {change_summary}")
-    
-    def list_tasks(self, status_filter: Optional[str] = None, smart_mode: bool = True):
+        versions = self.store.history(self.board, task_uuid)
+        occurrence = None if versions else self._resolve_occurrence(task_uuid)
+        if occurrence:
+            versions = [occurrence]
+        if not versions:
+            print(f"❌ 未找到UUID为 {task_uuid} 的任务")
+            return
+        
+        print(f"\n📋 任务详情: {task_uuid}")
+        print("=" * 70)
+        
+        # 显示最新版本
+        latest = versions[0]
+        
+        print(f"📝 任务: {latest.task}")
+        print(f"📊 状态: {latest.status}")
+        print(f"⚡ 优先级: {latest.priority}")
+        print(f"📅 截止日期: {latest.due_date or '无'}")
+        print(f"🏷️ 类型: {latest.task_type or 'general'}")
+        print(f"⏱️ 预估工时: {latest.estimated_hours or 0}小时")
+        print(f"🕐 创建时间: {latest.created_at}")
+        if occurrence:
+            print(f"🔁 重复任务实例 (模板 {occurrence.change_summary.split()[-1][:8]}，更新、完成或删除时才写入记录)")
+        
+        # 显示智能优先级分析
+        priority_info = self._score_row(occurrence.score_row(), _today_day_number()) if occurrence else self.score_task(task_uuid)
+        if priority_info:
+            display = priority_info.display_info
+            print(f"\n🎯 智能优先级分析:")
+            print(f"   动态权重: {priority_info.dynamic_weight:.1f}/{self.rules.weight_cap:.0f}")
+            print(f"   {display['action']}")
+            
+            if priority_info.time_pressure > 0:
+                time_info = priority_info.time_pressure_info
+                print(f"   {time_info['color']} 时间压力: {time_info['level']} (+{priority_info.time_pressure:.0f}%)")
+        
+        # 显示版本历史
+        if len(versions) > 1:
+            print(f"\n📚 版本历史 ({len(versions)} 个版本):")
+            print("─" * 70)
+            for record in versions:
+                print(f"v{record.version} | {record.operation_type} | {record.created_at} | {record.change_summary}")
+    
+    def list_tasks(self, status_filter: Optional[str] = None, smart_mode: bool = True,
+                   date_from: Optional[str] = None, date_to: Optional[str] = None, top: Optional[int] = None):
         """列出任务"""
         if smart_mode:
-            self.show_enhanced_task_list(status_filter)
+            self.show_enhanced_task_list(status_filter, date_from, date_to, top)
         else:
-            self.show_basic_task_list(status_filter)
+            self.show_basic_task_list(status_filter, date_from, date_to)
     
-    def show_basic_task_list(self, status_filter: Optional[str] = None):
-        """显示基础任务列表"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            if status_filter:
-                cursor.execute('''
-                    SELECT u.task_uuid, u.task, u.status, u.priority, u.due_date
-                    FROM todo_unified u
-                    JOIN (
-                        SELECT task_uuid, MAX(version) as max_version
-                        FROM todo_unified GROUP BY task_uuid
-                    ) latest ON u.task_uuid = latest.task_uuid AND u.version = latest.max_version
-                    WHERE u.operation_type != 'delete' AND u.status = ?
-                    ORDER BY u.created_at DESC
-                ''', (status_filter,))
-            else:
-                cursor.execute('''
-                    SELECT u.task_uuid, u.task, u.status, u.priority, u.due_date
-                    FROM todo_unified u
-                    JOIN (
-                        SELECT task_uuid, MAX(version) as max_version
-                        FROM todo_unified GROUP BY task_uuid
-                    ) latest ON u.task_uuid = latest.task_uuid AND u.version = latest.max_version
-                    WHERE u.operation_type != 'delete'
-                    ORDER BY u.created_at DESC
-                ''')
-            
-            tasks = cursor.fetchall()
-            
-            if not tasks:
-                print("📝 暂无任务")
-                return
-            
-            print(f"\n📋 基础任务列表 (共 {len(tasks)} 个)")
-            print("=" * 80)
-            print(f"{'UUID[:8]':<10} {'任务':<30} {'状态':<12} {'优先级':<15} {'截止日期':<12}")
-            print("-" * 80)
+    def _due_range(self, date_from: Optional[str] = None, date_to: Optional[str] = None) -> tuple:
+        """把截止日期范围转换为整数天数 (due_from, due_to)，未指定的一端为 None"""
+        days = []
+        for value in (date_from, date_to):
+            day = _to_day_number(value) if value else None
+            if value and day is None:
+                raise ValueError(f"无效日期: {value} (格式: YYYY-MM-DD)")
+            days.append(day)
+        return tuple(days)
+    
+    def _due_range_conditions(self, date_from: Optional[str] = None, date_to: Optional[str] = None) -> tuple:
+        """把截止日期范围转换为 due_day 条件 (走 idx_board_due_day 索引范围扫描)"""
+        conditions = []
+        params = []
+        for day, operator in zip(self._due_range(date_from, date_to), ('>=', '<=')):
+            if day is not None:
+                conditions.append(f'u.due_day {operator} ?')
+                params.append(day)
+        return conditions, params
+    
+    def _current_where(self, conditions: List[str]) -> str:
+        """当前看板中各任务最新且未删除版本的 WHERE 子句 (首个参数为 self.board)"""
+        return ' AND '.join(['u.board = ?', _LATEST_VERSION_SQL, "u.operation_type != 'delete'"] + conditions)
+    
+    def _query_current_scores(self, query: TaskQuery, recurring: bool = False) -> TaskScoreTable:
+        """按条件查询当前版本的活跃任务，并在同一次遍历中完成批量评分
+        
+        recurring: 同时展开查询窗口内尚未写入的重复任务实例
+        """
+        today = _today_day_number() if query.today is None else query.today
+        scores = TaskScoreTable()
+        for record in self.store.iter_current(self.board, query._replace(today=today)):
+            scores.append(self._score_row(record.score_row(), today))
+        if not recurring:
+            return scores
+        
+        quadrant = query.quadrant.upper() if query.quadrant else None
+        for record in self._occurrence_records(query, today):
+            score = self._score_row(record.score_row(), today)
+            if quadrant is None or _QUADRANTS[score.final_priority] == quadrant:
+                scores.append(score)
+        if query.top is not None and len(scores) > query.top:
+            ranked = TaskScoreTable()
+            for score in scores.ranked(query.top):
+                ranked.append(score)
+            scores = ranked
+        return scores
+    
+    def _occurrence_records(self, query: TaskQuery, today: int) -> List[TaskRecord]:
+        """在查询的截止日期窗口内展开重复任务模板，跳过已写入 todo_unified 的实例
+        
+        未指定日期范围时每个模板只取 _RECURRING_LOOKAHEAD 天内最近的一次；只指定 due_from 时窗口为
+        从该日起的 _RECURRING_LOOKAHEAD 天；只指定 due_to 时窗口为今天到 due_to (今天之前的实例不展开，
+        因此 overdue 不含虚拟实例)。开销与模板数 × 窗口内实例数成正比，与历史实例无关。
+        """
+        if query.task_uuid is not None or query.status not in (None, 'todo'):
+            return []
+        next_only = query.due_from is None and query.due_to is None
+        day_from = today if query.due_from is None else query.due_from
+        day_to = day_from + _RECURRING_LOOKAHEAD - 1 if query.due_to is None else query.due_to
+        keyword = query.keyword.lower() if query.keyword else None
+        
+        expanded = [(template, list(template.occurrence_days(day_from, day_to)))
+                    for template in self.store.iter_templates(self.board)
+                    if keyword is None or keyword in template.task.lower()]
+        existing = self.store.existing_uuids(self.board, [template.occurrence_uuid(day)
+                                                          for template, days in expanded for day in days])
+        records = []
+        for template, days in expanded:
+            for day in days:
+                if template.occurrence_uuid(day) not in existing:
+                    records.append(template.occurrence(day))
+                    if next_only:
+                        break
+        if query.order_by == 'due':
+            records.sort(key=lambda record: record.due_day)
+        return records
+    
+    def _resolve_occurrence(self, task_uuid: str) -> Optional[TaskRecord]:
+        """把实例 UUID 还原为重复任务模板在那一天的虚拟记录 (不是有效实例时返回 None)"""
+        parts = _split_occurrence_uuid(task_uuid)
+        if parts is None:
+            return None
+        prefix, day = parts
+        for template in self.store.iter_templates(self.board):
+            if template.template_uuid[:24] == prefix and day in template.occurrence_days(day, day):
+                return template.occurrence(day)
+        return None
+    
+    def _materialize_occurrence(self, task_uuid: str) -> Optional[TaskRecord]:
+        """把尚未写入的重复任务实例写成真实任务的第一个版本 (之后按普通任务更新)"""
+        occurrence = self._resolve_occurrence(task_uuid)
+        if occurrence is None:
+            return None
+        record = self.store.append_version(
+            self.board, task_uuid, {field: getattr(occurrence, field) for field in _NEW_TASK_DEFAULTS},
+            'create', f'Materialized {occurrence.due_date} from recurring template {occurrence.change_summary.split()[-1][:8]}'
+        )
+        self._notify(record)
+        return record
+    
+    def _short_uuid_formatter(self):
+        """返回列表用的短 ID 函数: 同一模板的各次实例 UUID 前 8 位相同，所以实例在后面带上日期"""
+        prefixes = {template.template_uuid[:24] for template in self.store.iter_templates(self.board, active_only=False)}
+        
+        def short_uuid(task_uuid: str) -> str:
+            parts = _split_occurrence_uuid(task_uuid) if task_uuid[:24] in prefixes else None
+            return f'{task_uuid[:8]}@{_from_day_number(parts[1])[5:]}' if parts else task_uuid[:8]
+        
+        return short_uuid
+    
+    @_cached_output('list_basic')
+    def show_basic_task_list(self, status_filter: Optional[str] = None,
+                             date_from: Optional[str] = None, date_to: Optional[str] = None):
+        """显示基础任务列表"""
+        due_from, due_to = self._due_range(date_from, date_to)
+        query = TaskQuery(status=status_filter, due_from=due_from, due_to=due_to)
+        tasks = list(self.store.iter_current(self.board, query))
+        tasks.extend(self._occurrence_records(query, _today_day_number()))
+        
+        if not tasks:
+            print("📝 暂无任务")
+            return
+        
+        short_uuid = self._short_uuid_formatter()
+        uuid_shorts = [short_uuid(record.task_uuid) for record in tasks]
+        uuid_width = max(10, max(map(len, uuid_shorts)) + 2)
+        
+        print(f"\n📋 基础任务列表 (共 {len(tasks)} 个)")
+        print("=" * 80)
+        print(f"{'UUID[:8]':<{uuid_width}} {'任务':<30} {'状态':<12} {'优先级':<15} {'截止日期':<12}")
+        print("-" * 80)
+        
+        for record, uuid_short in zip(tasks, uuid_shorts):
+            task_display = record.task[:27] + "..." if len(record.task) > 30 else record.task
+            due_display = record.due_date or "无"
             
-            for task_uuid, task, status, priority, due_date in tasks:
-                uuid_short = task_uuid[:8]
-                task_display = task[:27] + "..." if len(task) > 30 else task
-                due_display = due_date or "无"
-                
-                print(f"{uuid_short:<10} {task_display:<30} {status:<12} {priority:<15} {due_display:<12}")
+            print(f"{uuid_short:<{uuid_width}} {task_display:<30} {record.status:<12} {record.priority:<15} {due_display:<12}")
     
-    def show_enhanced_task_list(self, status_filter: Optional[str] = None):
+    @_cached_output('list')
+    def show_enhanced_task_list(self, status_filter: Optional[str] = None,
+                                date_from: Optional[str] = None, date_to: Optional[str] = None,
+                                top: Optional[int] = None):
         """显示增强版智能优先级任务列表"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+        title = f"🎯 智能优先级任务列表 (前 {top} 个)" if top else "🎯 智能优先级任务列表"
+        self._render_smart_list(self.score_tasks(status_filter, date_from, date_to, top=top), title)
+    
+    @_cached_output('due')
+    def show_due_tasks(self, within_days: int = 3):
+        """显示未来N天内到期的未完成任务 (due_day 索引范围扫描)"""
+        today = _today_day_number()
+        scores = self._query_current_scores(TaskQuery(
+            open_only=True, due_from=today, due_to=today + within_days, order_by='due', today=today
+        ), recurring=True)
+        
+        self._render_smart_list(scores, f"📅 {within_days} 天内到期任务 (截至 {_from_day_number(today + within_days)})")
+    
+    @_cached_output('overdue')
+    def show_overdue_tasks(self):
+        """显示已逾期的未完成任务 (due_day 索引范围扫描)"""
+        today = _today_day_number()
+        scores = self._query_current_scores(TaskQuery(open_only=True, due_to=today - 1, order_by='due', today=today))
+        
+        self._render_smart_list(scores, "🚨 已逾期任务")
+    
+    def _render_smart_list(self, scores, title: str):
+        """按动态权重排序并渲染智能任务列表 (scores 为 TaskScoreTable 或已排序的 TaskScore 列表)"""
+        if not len(scores):
+            print("📝 暂无任务")
+            return
+        
+        # 按动态权重排序
+        task_priorities = scores.ranked() if isinstance(scores, TaskScoreTable) else scores
+        short_uuid = self._short_uuid_formatter()
+        uuid_shorts = [short_uuid(task_info.task_uuid) for task_info in task_priorities]
+        uuid_width = max(10, max(map(len, uuid_shorts)) + 2)
+        
+        # 显示表头
+        print(f"\n{title}")
+        print("=" * 125)
+        print(f"{'UUID[:8]':<{uuid_width}} {'任务名称':<45} {'智能优先级':<20} {'权重':<8} {'时间压力':<20} {'截止日期':<12}")
+        print("─" * 125)
+        
+        # 显示任务
+        for task_info, uuid_short in zip(task_priorities, uuid_shorts):
+            display = task_info.display_info
             
-            # 获取所有活跃任务
-            if status_filter:
-                cursor.execute('''
-                    SELECT u.task_uuid
-                    FROM todo_unified u
-                    JOIN (
-                        SELECT task_uuid, MAX(version) as max_version
-                        FROM todo_unified GROUP BY task_uuid
-                    ) latest ON u.task_uuid = latest.task_uuid AND u.version = latest.max_version
-                    WHERE u.operation_type != 'delete' AND u.status = ?
-                    ORDER BY u.created_at DESC
-                ''', (status_filter,))
-            else:
-                cursor.execute('''
-                    SELECT u.task_uuid
-                    FROM todo_unified u
-                    JOIN (
-                        SELECT task_uuid, MAX(version) as max_version
-                        FROM todo_unified GROUP BY task_uuid
-                    ) latest ON u.task_uuid = latest.task_uuid AND u.version = latest.max_version
-                    WHERE u.operation_type != 'delete'
-                    ORDER BY u.created_at DESC
-                ''')
+            # 智能截断任务名称
+            task_name = self._truncate_text(task_info.task, 42)
             
-            task_uuids = [row[0] for row in cursor.fetchall()]
+            # 彩色显示优先级
+            priority_display = f"{display['bg_color']}{display['text_color']} {display['icon']} {display['name']} {self.reset_color}"
             
-            if not task_uuids:
-                print("📝 暂无任务")
-                return
+            # 时间压力显示
+            time_info = task_info.time_pressure_info
+            if task_info.time_pressure > 0:
+                time_display = f"{time_info['color']} {time_info['level']} (+{task_info.time_pressure:.0f}%)"
+            else:
+                time_display = f"{time_info['color']} 无时间压力"
+            
+            due_date = task_info.due_date or "无截止"
             
-            # 计算所有任务的智能优先级
-            task_priorities = []
-            for uuid in task_uuids:
-                priority_info = self.calculate_smart_priority(uuid)
-                if priority_info:
-                    task_priorities.append(priority_info)
-            
-            # 按动态权重排序
-            task_priorities.sort(key=lambda x: x['dynamic_weight'], reverse=True)
-            
-            # 显示表头
-            print("\n🎯 智能优先级任务列表")
-            print("=" * 125)
-            print(f"{'UUID[:8]':<10} {'任务名称':<45} {'智能优先级':<20} {'权重':<8} {'时间压力':<20} {'截止日期':<12}")
-            print("─" * 125)
-            
-            # 显示任务
-            for task_info in task_priorities:
-                display = task_info['display_info']
-                uuid_short = task_info['task_uuid'][:8]
+            print(f"{uuid_short:<{uuid_width}} {task_name:<45} {priority_display:<20} {task_info.dynamic_weight:<8.1f} {time_display:<20} {due_date:<12}")
+        
+        print(f"\n📊 总计: {len(task_priorities)} 个任务")
+    
+    def watch_board(self, view: str = 'list', status_filter: Optional[str] = None,
+                    interval: float = 2.0, max_iterations: Optional[int] = None):
+        """实时监视模式: 常驻一个连接轻量轮询，只对新追加的版本记录做增量重算"""
+        conn = self._connect()
+        board = LiveBoard(self._score_row, status_filter)
+        scheduler = EscalationScheduler(self.rules)
+        escalations = []
+        last_data_version = None
+        last_id = 0
+        iteration = 0
+        
+        def load_rows(cursor, sql, params):
+            nonlocal last_id
+            changed = 0
+            for record in map(TaskRecord._make, cursor.execute(sql, params)):
+                last_id = max(last_id, record.id)
+                scheduler.track(record)
+                if board.apply(record.id, record.version, record.status, record.operation_type, record.score_row()):
+                    changed += 1
+            return changed
+        
+        try:
+            while max_iterations is None or iteration < max_iterations:
+                iteration += 1
+                started = time.monotonic()
+                cursor = conn.cursor()
+                data_version = cursor.execute('PRAGMA data_version').fetchone()[0]
+                max_id = cursor.execute('SELECT MAX(id) FROM todo_unified').fetchone()[0] or 0
+                today = _today_day_number()
+                changed = None
                 
-                # 智能截断任务名称
-                task_name = self._truncate_text(task_info['task'], 42)
+                if last_data_version is None or max_id < last_id or (data_version != last_data_version and max_id == last_id):
+                    # 首次加载，或出现非追加式的修改: 全量重建
+                    board = LiveBoard(self._score_row, status_filter)
+                    scheduler = EscalationScheduler(self.rules, today)
+                    last_id = 0
+                    changed = load_rows(cursor, f'''
+                        SELECT {_RECORD_COLUMNS}
+                        FROM todo_unified u
+                        WHERE u.board = ? AND {_LATEST_VERSION_SQL}
+                        ORDER BY u.id
+                    ''', (self.board,))
+                    last_id = max(last_id, max_id)
+                    mode = '全量加载'
+                elif max_id > last_id:
+                    # 只取新追加的版本记录 (走 id 主键范围扫描)；其他看板的追加同样推进 last_id，
+                    # 本看板没有变化时不重绘
+                    changed = load_rows(cursor, f'''
+                        SELECT {_RECORD_COLUMNS} FROM todo_unified u WHERE u.id > ? AND u.board = ? ORDER BY u.id
+                    ''', (last_id, self.board)) or None
+                    last_id = max(last_id, max_id)
+                    mode = '增量更新'
                 
-                # 彩色显示优先级
-                priority_display = f"{display['bg_color']}{display['text_color']} {display['icon']} {display['name']} {self.reset_color}"
+                if today != board.today:
+                    # 跨过午夜: 重新计算时间压力分档，并取出刚跨入新档位的任务
+                    board.rebucket(today)
+                    escalations = scheduler.advance(today)
+                    changed = len(board)
+                    mode = '日期切换重算'
                 
-                # 时间压力显示
-                time_info = task_info['time_pressure_info']
-                if task_info['time_pressure'] > 0:
-                    time_display = f"{time_info['color']} {time_info['level']} (+{task_info['time_pressure']:.0f}%)"
-                else:
-                    time_display = f"{time_info['color']} 无时间压力"
+                last_data_version = data_version
                 
-                due_date = task_info['due_date'] or "无截止"
+                if changed is not None:
+                    elapsed = (time.monotonic() - started) * 1000
+                    print("\033[2J\033[H", end='')
+                    print(f"👀 实时监视 ({view}) | 看板 {self.board} | {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} | "
+                          f"{mode}: {changed} 个任务 | 耗时 {elapsed:.1f}ms | Ctrl+C 退出")
+                    if escalations:
+                        print(f"⏫ 今日截止升级 {len(escalations)} 个任务: " + ', '.join(
+                            self._truncate_text(event.task, 20) for event in escalations[:5]
+                        ) + (' ...' if len(escalations) > 5 else ''))
+                    if view == 'matrix':
+                        self._render_matrix(board.ranked())
+                    else:
+                        self._render_smart_list(board.ranked(), "🎯 智能优先级任务列表")
+                    sys.stdout.flush()
                 
-                print(f"{uuid_short:<10} {task_name:<45} {priority_display:<20} {task_info['dynamic_weight']:<8.1f} {time_display:<20} {due_date:<12}")
-            
-            print(f"\n📊 总计: {len(task_priorities)} 个任务")
+                if max_iterations is None or iteration < max_iterations:
+                    time.sleep(interval)
+        except KeyboardInterrupt:
+            print("\n👋 已退出实时监视")
+        finally:
+            conn.close()
     
-    def search_tasks(self, keyword: str):
+    @_cached_output('search')
+    def search_tasks(self, keyword: str, date_from: Optional[str] = None, date_to: Optional[str] = None):
         """搜索任务"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                SELECT u.task_uuid, u.task, u.status, u.priority, u.due_date
-                FROM todo_unified u
-                JOIN (
-                    SELECT task_uuid, MAX(version) as max_version
-                    FROM todo_unified GROUP BY task_uuid
-                ) latest ON u.task_uuid = latest.task_uuid AND u.version = latest.max_version
-                WHERE u.operation_type != 'delete' AND u.task LIKE ?
-                ORDER BY u.created_at DESC
-            ''', (f'%{keyword}%',))
-            
-            results = cursor.fetchall()
-            
-            if not results:
-                print(f"🔍 未找到包含 '{keyword}' 的任务")
-                return
+        results = list(self.store.search(self.board, keyword, *self._due_range(date_from, date_to)))
+        
+        if not results:
+            print(f"🔍 未找到包含 '{keyword}' 的任务")
+            return
+        
+        print(f"\n🔍 搜索结果 (关键词: {keyword})")
+        print("=" * 80)
+        print(f"{'UUID[:8]':<10} {'任务':<35} {'状态':<12} {'优先级':<15} {'截止日期':<12}")
+        print("-" * 80)
+        
+        for record in results:
+            uuid_short = record.task_uuid[:8]
+            task = record.task
+            task_display = task[:32] + "..." if len(task) > 35 else task
+            due_display = record.due_date or "无"
             
-            print(f"\n🔍 搜索结果 (关键词: {keyword})")
-            print("=" * 80)
-            print(f"{'UUID[:8]':<10} {'任务':<35} {'状态':<12} {'优先级':<15} {'截止日期':<12}")
-            print("-" * 80)
+            # 高亮关键词
+            if keyword.lower() in task.lower():
+                task_display = task_display.replace(keyword, f"**{keyword}**")
             
-            for task_uuid, task, status, priority, due_date in results:
-                uuid_short = task_uuid[:8]
-                task_display = task[:32] + "..." if len(task) > 35 else task
-                due_display = due_date or "无"
-                
-                # 高亮关键词
-                if keyword.lower() in task.lower():
-                    task_display = task_display.replace(keyword, f"**{keyword}**")
-                
-                print(f"{uuid_short:<10} {task_display:<35} {status:<12} {priority:<15} {due_display:<12}")
+            print(f"{uuid_short:<10} {task_display:<35} {record.status:<12} {record.priority:<15} {due_display:<12}")
     
     def delete_task(self, task_uuid: str):
         """删除任务（软删除）"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            # 检查任务是否存在
-            cursor.execute('''
-                SELECT task, version FROM todo_unified 
-                WHERE task_uuid = ? 
-                ORDER BY version DESC LIMIT 1
-            ''', (task_uuid,))
-            
-            result = cursor.fetchone()
-            if not result:
-                print(f"❌ 未找到UUID为 {task_uuid} 的任务")
-                return
-            
-            task, current_version = result
-            
-            # 创建删除记录
-            cursor.execute('''
+        latest = self.store.get_latest(self.board, task_uuid) or self._materialize_occurrence(task_uuid)
+        record = latest and self.store.append_version(self.board, task_uuid, {}, 'delete',
+                                                      f'Deleted task: {latest.task[:50]}')
+        if not record:
+            print(f"❌ 未找到UUID为 {task_uuid} 的任务")
+            return
+        self._notify(record)
+        
+        print(f"✅ 任务已删除: {record.task}")
+    
+    def find_duplicates(self, text: str, exclude_uuid: Optional[str] = None,
+                        threshold: float = _DUPLICATE_THRESHOLD) -> List[tuple]:
+        """查找与 text 近似重复的当前任务，返回按相似度降序的 [(记录, 相似度)]
+        
+        先用 LSH 桶索引取候选，再逐个计算字符 shingle 的精确 Jaccard 相似度。
+        """
+        shingles = _char_shingles(text)
+        if not shingles:
+            return []
+        
+        duplicates = []
+        for task_uuid in self.store.similar_candidates(self.board, _task_band_keys(text)):
+            if task_uuid == exclude_uuid:
+                continue
+            record = self.store.get_latest(self.board, task_uuid)
+            if record is None or record.operation_type == 'delete':
+                continue
+            similarity = _jaccard(shingles, _char_shingles(record.task))
+            if similarity >= threshold:
+                duplicates.append((record, similarity))
+        duplicates.sort(key=lambda item: (-item[1], item[0].created_at or '', item[0].id))
+        return duplicates
+    
+    def duplicate_groups(self, threshold: float = _DUPLICATE_THRESHOLD) -> List[List[TaskRecord]]:
+        """把当前看板的近似重复任务分组 (每组按创建时间排序，组内第一个为保留项)
+        
+        文本归一化后完全相同的任务先合并，只对不同的 shingle 集合计算 MinHash。按创建
+        顺序处理: 与某个已有组的保留项同桶且精确 Jaccard 达到阈值就并入该组，否则自成
+        一组，因此组内每个任务都与保留项相似 (不会经相似链把不相干的任务串成一组)。
+        桶里只放保留项，每个任务最多精确比较 _LSH_BUCKET_SCAN 个候选 (按共享桶数优先)，
+        整体对任务数近似线性。
+        顺带用当前任务重建存储引擎里的 LSH 桶索引。
+        """
+        members = {}        # shingle 集合 -> 文本相同的任务列表
+        for record in self.store.iter_current(self.board, TaskQuery(order_by='id')):
+            shingles = _char_shingles(record.task)
+            if shingles:
+                members.setdefault(shingles, []).append(record)
+        
+        def created_order(record: TaskRecord) -> tuple:
+            return record.created_at or '', record.id
+        
+        for records in members.values():
+            records.sort(key=created_order)
+        
+        buckets = {}        # 桶键 -> 保留项的 shingle 集合 (按加入顺序)
+        groups = {}         # 保留项的 shingle 集合 -> 组内任务
+        entries = []
+        for shingles in sorted(members, key=lambda shingles: created_order(members[shingles][0])):
+            band_keys = _lsh_band_keys(_minhash_signature(shingles))
+            entries.extend((record.task_uuid, band_keys) for record in members[shingles])
+            # 共享桶越多的保留项越可能相似，优先精确比较
+            shared = Counter()
+            for key in band_keys:
+                shared.update(buckets.get(key, ())[-_LSH_BUCKET_SCAN:])
+            leader = next((other for other, _ in shared.most_common(_LSH_BUCKET_SCAN)
+                           if _jaccard(shingles, other) >= threshold), None)
+            if leader is None:
+                groups[shingles] = list(members[shingles])
+                for key in band_keys:
+                    buckets.setdefault(key, []).append(shingles)
+            else:
+                groups[leader].extend(members[shingles])
+        self.store.reindex_similarity(self.board, entries)
+        
+        return [group for group in groups.values() if len(group) > 1]
+    
+    def dedupe(self, threshold: float = _DUPLICATE_THRESHOLD, merge: bool = False) -> int:
+        """显示近似重复的任务组；merge 为真时保留每组最早创建的任务，其余软删除，返回删除的任务数"""
+        groups = self.duplicate_groups(threshold)
+        
+        print(f"\n🧬 近似重复任务 (相似度 ≥ {threshold:.0%}, 共 {len(groups)} 组)")
+        print("=" * 80)
+        if not groups:
+            print("📝 没有发现近似重复的任务")
+            return 0
+        
+        merged = 0
+        for number, group in enumerate(groups, 1):
+            keep = group[0]
+            keep_shingles = _char_shingles(keep.task)
+            print(f"\n第 {number} 组 ({len(group)} 个任务):")
+            print(f"   ✅ {keep.task_uuid[:8]}  {self._truncate_text(keep.task, 50)}  (保留)")
+            for record in group[1:]:
+                similarity = _jaccard(keep_shingles, _char_shingles(record.task))
+                print(f"   🔁 {record.task_uuid[:8]}  {self._truncate_text(record.task, 50)}  (相似度 {similarity:.0%})")
+                if merge:
+                    deleted = self.store.append_version(self.board, record.task_uuid, {}, 'delete',
+                                                        f'Merged duplicate into {keep.task_uuid[:8]}')
+                    self._notify(deleted)
+                    merged += deleted is not None
+        
+        print()
+        if merge:
+            print(f"✅ 合并完成! 已软删除 {merged} 个重复任务 (可通过 show <UUID> 查看历史)")
+        else:
+            print("💡 加 --merge 保留每组最早创建的任务，其余软删除")
+        return merged
+    
+    def add_recurring(self, task: str, rule: str, on: Optional[str] = None, priority: str = 'normal',
+                      task_type: str = 'general', estimated_hours: float = 0,
+                      start: Optional[str] = None, until: Optional[str] = None) -> Optional[str]:
+        """新增重复任务模板，返回模板 UUID
+        
+        rule: daily | weekly | monthly
+        on: weekly 时为星期列表 (如 mon,wed,fri)，monthly 时为每月几号；默认取开始日期
+        """
+        if rule not in _RECURRENCE_RULES:
+            print(f"❌ 不支持的重复规则: {rule} (可选: {', '.join(_RECURRENCE_RULES)})")
+            return None
+        # 与 todo_unified 的 CHECK 约束一致，否则实例在第一次修改写入时才失败
+        if priority not in _QUADRANTS:
+            print(f"❌ 无效的优先级: {priority} (可选: {', '.join(_QUADRANTS)})")
+            return None
+        start_day, end_day = self._due_range(start, until)
+        start_day = _today_day_number() if start_day is None else start_day
+        
+        weekdays, month_day = (), None
+        if rule == 'weekly':
+            names = [name.strip().lower()[:3] for name in on.split(',')] if on else [_WEEKDAY_NAMES[_weekday(start_day)]]
+            if any(name not in _WEEKDAY_NAMES for name in names):
+                print(f"❌ 无效的星期: {on} (可选: {', '.join(_WEEKDAY_NAMES)})")
+                return None
+            weekdays = tuple(sorted({_WEEKDAY_NAMES.index(name) for name in names}))
+        elif rule == 'monthly':
+            month_day = int(on) if on else (_EPOCH_DATE + timedelta(days=start_day)).day
+            if not 1 <= month_day <= 31:
+                print(f"❌ 无效的日期: {on} (应为 1-31)")
+                return None
+        
+        template = RecurringTemplate(str(uuid.uuid4()), self.board, task, priority, task_type, estimated_hours,
+                                     rule, weekdays, month_day, start_day, end_day, None)
+        self.store.save_template(template)
+        
+        print(f"✅ 重复任务模板创建成功!")
+        print(f"   UUID: {template.template_uuid}")
+        print(f"   任务: {task}")
+        print(f"   规则: {template.rule_text} (自 {_from_day_number(start_day)}"
+              f"{' 至 ' + _from_day_number(end_day) if end_day is not None else ''})")
+        return template.template_uuid
+    
+    def delete_recurring(self, template_uuid: str) -> bool:
+        """停用重复任务模板 (可用 UUID 前缀；已写入的实例保留)"""
+        matches = [template for template in self.store.iter_templates(self.board)
+                   if template.template_uuid.startswith(template_uuid)]
+        if len(matches) != 1:
+            print(f"❌ {'未找到' if not matches else '有多个匹配'}UUID为 {template_uuid} 的重复任务模板")
+            return False
+        self.store.save_template(matches[0]._replace(active=False))
+        print(f"✅ 重复任务模板已停用: {matches[0].task}")
+        return True
+    
+    def show_recurring(self):
+        """列出当前看板的重复任务模板及下一次实例"""
+        templates = list(self.store.iter_templates(self.board))
+        if not templates:
+            print("📝 暂无重复任务模板")
+            return
+        
+        today = _today_day_number()
+        print(f"\n🔁 重复任务模板 (共 {len(templates)} 个)")
+        print("=" * 100)
+        print(f"{'UUID[:8]':<10} {'任务':<32} {'规则':<16} {'优先级':<18} {'下一次':<12} {'截止':<12}")
+        print("-" * 100)
+        for template in templates:
+            upcoming = next(template.occurrence_days(today, today + 366), None)
+            print(f"{template.template_uuid[:8]:<10} {self._truncate_text(template.task, 30):<32} "
+                  f"{template.rule_text:<16} {template.priority:<18} "
+                  f"{_from_day_number(upcoming) if upcoming is not None else '-':<12} "
+                  f"{_from_day_number(template.end_day) if template.end_day is not None else '无':<12}")
+    
+    @_cached_output('forecast')
+    def show_forecast(self, days: int = 14):
+        """未来 N 天的工作量预测: 按截止日期汇总未完成任务和重复任务实例"""
+        today = _today_day_number()
+        query = TaskQuery(open_only=True, due_from=today, due_to=today + days - 1, order_by='due', today=today)
+        records = list(self.store.iter_current(self.board, query))
+        records.extend(self._occurrence_records(query, today))
+        by_day = {}
+        for record in records:
+            by_day.setdefault(record.due_day, []).append((self._score_row(record.score_row(), today), record))
+        
+        total_hours = sum(record.estimated_hours or 0 for record in records)
+        recurring = sum(record.id is None for record in records)
+        print(f"\n🔮 工作量预测 ({_from_day_number(today)} → {_from_day_number(today + days - 1)})")
+        print("=" * 100)
+        for day in range(today, today + days):
+            entries = sorted(by_day.get(day, ()), key=lambda entry: -entry[0].dynamic_weight)
+            hours = sum(entry[1].estimated_hours or 0 for entry in entries)
+            print(f"\n📅 {_from_day_number(day)} 周{_WEEKDAY_LABELS[_weekday(day)]}  "
+                  f"{len(entries)} 个任务  {hours:.1f}h  {'█' * min(int(hours), 40)}")
+            for score, record in entries:
+                marker = '🔁' if record.id is None else '📌'
+                display = score.display_info
+                print(f"   {marker} {record.task_uuid}  {self._truncate_text(record.task, 30):<32} "
+                      f"{display['icon']} {display['name']:<10} {record.estimated_hours or 0:g}h")
+        
+        print(f"\n📊 总计: {len(records)} 个任务 (其中重复任务实例 {recurring} 个)，预估 {total_hours:.1f} 小时")
+        if recurring:
+            print("💡 完成重复任务实例: update <UUID> status completed (此时才写入记录)")
+    
+    def escalation_scheduler(self, since: Optional[int] = None, until: Optional[int] = None,
+                             track_writes: bool = False) -> EscalationScheduler:
+        """从截止日期索引建立升级调度器 (since 为起始日的整数天数，默认今天)
+        
+        只载入之后还会跨越档位的未完成任务: 截止日期在 since 之后足够远，
+        且 (指定 until 时) 第一次跨越不晚于 until。
+        track_writes: 长期使用的调度器随本实例的写入增量更新 (用 remove_listener(scheduler.track) 取消)
+        """
+        since = _today_day_number() if since is None else since
+        steps = self.rules.pressure_steps
+        scheduler = EscalationScheduler(self.rules, since)
+        if steps:
+            due_to = until + 1 + steps[-1] if until is not None else None
+            scheduler.load(self.store.iter_current(self.board, TaskQuery(
+                open_only=True, due_from=since + steps[0] + 2, due_to=due_to, order_by='due'
+            )))
+        if track_writes:
+            self.add_listener(scheduler.track)
+        return scheduler
+    
+    def show_escalations(self, since: Optional[str] = None, into: Optional[str] = None):
+        """显示自 since 以来跨入更高时间压力档位的任务 (into 为 Q1-Q4 时只显示升级进入该象限的)"""
+        today = _today_day_number()
+        since_day = _to_day_number(since) if since else today - 1
+        if since_day is None:
+            raise ValueError(f"无效日期: {since} (格式: YYYY-MM-DD)")
+        events = self.escalation_scheduler(since_day, today).advance(today)
+        if into:
+            events = [event for event in events
+                      if event.quadrant_changed and _QUADRANTS.get(event.to_priority) == into.upper()]
+        
+        print(f"\n⏫ 截止升级事件 ({_from_day_number(since_day)} → {_from_day_number(today)}, 共 {len(events)} 个)")
+        print("=" * 100)
+        if not events:
+            print("📝 暂无升级")
+            return
+        print(f"{'日期':<12} {'UUID[:8]':<10} {'任务':<32} {'时间压力':<20} {'智能优先级':<34} {'权重':<6}")
+        print("-" * 100)
+        for event in events:
+            before = self.time_pressure_levels[event.from_level]
+            after = self.time_pressure_levels[event.to_level]
+            pressure = f"{before['level']} → {after['color']} {after['level']}"
+            priority = f"{event.from_priority} → {event.to_priority}" if event.quadrant_changed else event.to_priority
+            print(f"{event.date:<12} {event.task_uuid[:8]:<10} {self._truncate_text(event.task, 30):<32} "
+                  f"{pressure:<20} {priority:<34} {event.weight:<6}")
+    
+    def _bulk_conditions(self, filters: Dict[str, str], keyword: Optional[str] = None,
+                         date_from: Optional[str] = None, date_to: Optional[str] = None) -> tuple:
+        """把批量操作的筛选条件转换为 SQL 条件 (作用于每个任务的最新版本)"""
+        conditions, params = self._due_range_conditions(date_from, date_to)
+        for field, value in filters.items():
+            if field not in _UPDATABLE_FIELDS:
+                raise ValueError(f"不支持的筛选字段: {field}")
+            if field == 'due_date' and value == 'null':
+                conditions.append('u.due_date IS NULL')
+                continue
+            conditions.append(f'u.{field} = ?')
+            params.append(float(value) if field == 'estimated_hours' else value)
+        if keyword:
+            conditions.append('u.task LIKE ?')
+            params.append(f'%{keyword}%')
+        return conditions, params
+    
+    def _bulk_write(self, operation_type: str, set_values: Dict[str, str], conditions: List[str],
+                    params: List[Any], change_summary: str, dry_run: bool) -> int:
+        """用一条 INSERT ... SELECT 为所有匹配任务写入下一个版本，返回影响的任务数"""
+        where = self._current_where(conditions)
+        params = [self.board] + params
+        
+        if dry_run:
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                cursor.execute(f'SELECT COUNT(*) FROM todo_unified u WHERE {where}', params)
+                return cursor.fetchone()[0]
+        
+        # 新版本各列: 被 --set 覆盖的列绑定参数，其余沿用最新版本的值
+        select_columns = []
+        select_params = []
+        for column in ('task', 'status', 'priority', 'due_date', 'task_type', 'estimated_hours'):
+            if column in set_values:
+                value = set_values[column]
+                if column == 'due_date' and value == 'null':
+                    value = None
+                elif column == 'estimated_hours':
+                    value = float(value)
+                select_columns.append('?')
+                select_params.append(value)
+            else:
+                select_columns.append(f'u.{column}')
+        if 'due_date' in set_values:
+            select_columns.append('?')
+            select_params.append(_to_day_number(set_values['due_date']))
+        else:
+            select_columns.append('u.due_day')
+        
+        def write_versions(cursor):
+            cursor.execute('SELECT COALESCE(MAX(id), 0) FROM todo_unified')
+            last_id = cursor.fetchone()[0]
+            cursor.execute(f'''
                 INSERT INTO todo_unified (
-                    task_uuid, version, task, operation_type, change_summary
-                ) VALUES (?, ?, ?, ?, ?)
-            ''', (
-                task_uuid, current_version + 1, task, 'delete', f'Deleted task: {task[:50]}'
-            ))
-            
-            conn.commit()
+                    task_uuid, version, task, status, priority, due_date, task_type, estimated_hours,
+                    due_day, operation_type, change_summary, created_day, board
+                )
+                SELECT u.task_uuid, u.version + 1, {', '.join(select_columns)}, ?, ?, {_SQL_DAY_NOW}, u.board
+                FROM todo_unified u
+                WHERE {where}
+            ''', select_params + [operation_type, change_summary] + params)
+            affected = cursor.rowcount
+            
+            # 同步 LSH 桶索引: 删除的任务移出，改写了内容的任务换成新文本的桶键
+            if operation_type == 'delete' or 'task' in set_values:
+                cursor.execute('SELECT task_uuid FROM todo_unified WHERE id > ?', (last_id,))
+                task_uuids = [row[0] for row in cursor.fetchall()]
+                cursor.executemany('DELETE FROM todo_lsh WHERE task_uuid = ?', [(task_uuid,) for task_uuid in task_uuids])
+                if operation_type != 'delete':
+                    band_keys = _task_band_keys(set_values['task'])
+                    cursor.executemany('INSERT INTO todo_lsh (board, band_key, task_uuid) VALUES (?, ?, ?)',
+                                       [(self.board, key, task_uuid) for task_uuid in task_uuids for key in band_keys])
+            return affected
+        
+        return self._run_write(write_versions)
+    
+    def bulk_update(self, filters: Dict[str, str], set_values: Dict[str, str], keyword: Optional[str] = None,
+                    date_from: Optional[str] = None, date_to: Optional[str] = None, dry_run: bool = False) -> int:
+        """按条件批量更新任务 (单条语句、单个事务)"""
+        for field in set_values:
+            if field not in _UPDATABLE_FIELDS:
+                print(f"❌ 不支持的字段: {field}")
+                return 0
+        if not set_values:
+            print("❌ 请使用 --set field=value 指定要更新的字段")
+            return 0
         
-        print(f"✅ 任务已删除: {task}")
+        conditions, params = self._bulk_conditions(filters, keyword, date_from, date_to)
+        summary = 'Bulk updated ' + ', '.join(f'{field}: {value}' for field, value in set_values.items())
+        affected = self._bulk_write('update', set_values, conditions, params, summary, dry_run)
+        
+        if dry_run:
+            print(f"🔍 预演: 将更新 {affected} 个任务")
+        else:
+            print(f"✅ 批量更新完成!")
+            print(f"   影响任务数: {affected}")
+            for field, value in set_values.items():
+                print(f"   {field} = {value}")
+        return affected
+    
+    def bulk_delete(self, filters: Dict[str, str], keyword: Optional[str] = None,
+                    date_from: Optional[str] = None, date_to: Optional[str] = None, dry_run: bool = False) -> int:
+        """按条件批量删除任务 (软删除，单条语句、单个事务)"""
+        conditions, params = self._bulk_conditions(filters, keyword, date_from, date_to)
+        affected = self._bulk_write('delete', {}, conditions, params, 'Bulk deleted', dry_run)
+        
+        if dry_run:
+            print(f"🔍 预演: 将删除 {affected} 个任务")
+        else:
+            print(f"✅ 批量删除完成!")
+            print(f"   影响任务数: {affected}")
+        return affected
     
-    def show_eisenhower_matrix(self):
+    @_cached_output('matrix')
+    def show_eisenhower_matrix(self, quadrant: Optional[str] = None):
         """显示艾森豪威尔矩阵视图"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+        # 一次查询完成所有活跃任务的评分 (指定象限时在查询内过滤)
+        self._render_matrix(self.score_tasks(order_by='id', quadrant=quadrant), quadrant)
+    
+    def _render_matrix(self, scores, only_quadrant: Optional[str] = None):
+        """按最终优先级分象限渲染矩阵 (only_quadrant 为 Q1-Q4 时只显示该象限)"""
+        # 按象限分类
+        matrix = {
+            'Q1_urgent_important': [],
+            'Q2_important': [],
+            'Q3_urgent': [],
+            'Q4_normal': []
+        }
+        
+        quadrant_map = {
+            'urgent_important': 'Q1_urgent_important',
+            'important': 'Q2_important',
+            'urgent': 'Q3_urgent',
+            'normal': 'Q4_normal'
+        }
+        
+        short_uuid = self._short_uuid_formatter()
+        for task_info in scores:
+            quadrant = quadrant_map.get(task_info.final_priority, 'Q4_normal')
+            matrix[quadrant].append(task_info)
+        
+        # 显示矩阵
+        print("\n" + "="*80)
+        print("🎯 艾森豪威尔矩阵 - 智能任务优先级管理")
+        print("="*80)
+        
+        print("\n📊 矩阵分布:")
+        print("┌─────────────────────────────────────┬─────────────────────────────────────┐")
+        print("│             重要 + 紧急              │             重要 + 不紧急            │")
+        print("│           🔥 Q1 - 立即执行           │           ⭐ Q2 - 计划安排           │")
+        print("├─────────────────────────────────────┼─────────────────────────────────────┤")
+        print("│            不重要 + 紧急             │           不重要 + 不紧急            │")
+        print("│           ⚡ Q3 - 委托处理           │           📝 Q4 - 消除删除           │")
+        print("└─────────────────────────────────────┴─────────────────────────────────────┘")
+        
+        # 显示各象限详情
+        quadrants = [
+        ('Q1_urgent_important', '🔥 Q1 象限 - 紧急且重要 (立即执行)'),
+        ('Q3_urgent', '⚡ Q3 象限 - 紧急但不重要 (委托处理)'),
+        ('Q2_important', '⭐ Q2 象限 - 重要但不紧急 (计划安排)'),
+        ('Q4_normal', '📝 Q4 象限 - 既不紧急也不重要 (考虑删除)')
+        ]
+        
+        for quadrant_key, title in quadrants:
+            if only_quadrant and not quadrant_key.startswith(only_quadrant.upper()):
+                continue
+            tasks = matrix.get(quadrant_key, [])
+            print(f"\n{title}")
+            print("─" * 70)
             
-            # 获取所有活跃任务UUID
-            cursor.execute('''
-                SELECT u.task_uuid
-                FROM todo_unified u
-                JOIN (
-                    SELECT task_uuid, MAX(version) as max_version
-                    FROM todo_unified GROUP BY task_uuid
-                ) latest ON u.task_uuid = latest.task_uuid AND u.version = latest.max_version
-                WHERE u.operation_type != 'delete'
-            ''')
+            if not tasks:
+                print("  📝 暂无任务")
+                continue
             
-            task_uuids = [row[0] for row in cursor.fetchall()]
-            
-            # 按象限分类
-            matrix = {
-                'Q1_urgent_important': [],
-                'Q2_important': [],
-                'Q3_urgent': [],
-                'Q4_normal': []
-            }
-            
-            quadrant_map = {
-                'urgent_important': 'Q1_urgent_important',
-                'important': 'Q2_important',
-                'urgent': 'Q3_urgent',
-                'normal': 'Q4_normal'
-            }
-            
-            for uuid in task_uuids:
-                priority_info = self.calculate_smart_priority(uuid)
-                if priority_info:
-                    final_priority = priority_info['final_priority']
-                    quadrant = quadrant_map.get(final_priority, 'Q4_normal')
-                    matrix[quadrant].append(priority_info)
-            
-            # 显示矩阵
-            print("\n" + "="*80)
-            print("🎯 艾森豪威尔矩阵 - 智能任务优先级管理")
-            print("="*80)
-            
-            print("\n📊 矩阵分布:")
-            print("┌─────────────────────────────────────┬─────────────────────────────────────┐")
-            print("│             重要 + 紧急              │             重要 + 不紧急            │")
-            print("│           🔥 Q1 - 立即执行           │           ⭐ Q2 - 计划安排           │")
-            print("├─────────────────────────────────────┼─────────────────────────────────────┤")
-            print("│            不重要 + 紧急             │           不重要 + 不紧急            │")
-            print("│           ⚡ Q3 - 委托处理           │           📝 Q4 - 消除删除           │")
-            print("└─────────────────────────────────────┴─────────────────────────────────────┘")
-            
-            # 显示各象限详情
-            quadrants = [
-            ('Q1_urgent_important', '🔥 Q1 象限 - 紧急且重要 (立即执行)'),
-            ('Q3_urgent', '⚡ Q3 象限 - 紧急但不重要 (委托处理)'),
-            ('Q2_important', '⭐ Q2 象限 - 重要但不紧急 (计划安排)'),
-            ('Q4_normal', '📝 Q4 象限 - 既不紧急也不重要 (考虑删除)')
-            ]
-            
-            for quadrant_key, title in quadrants:
-                tasks = matrix.get(quadrant_key, [])
-                print(f"\n{title}")
-                print("─" * 70)
-                
-                if not tasks:
-                    print("  📝 暂无任务")
-                    continue
-                
-                # 按权重排序
-                tasks.sort(key=lambda x: x['dynamic_weight'], reverse=True)
+            # 按权重排序
+            tasks.sort(key=lambda x: x.dynamic_weight, reverse=True)
+            
+            for task_info in tasks[:5]:  # 只显示前5个
+                # 智能截断任务名称
+                task_display = self._truncate_text(task_info.task, 55)
                 
-                for task_info in tasks[:5]:  # 只显示前5个
-                    # 智能截断任务名称
-                    task_display = self._truncate_text(task_info['task'], 55)
-                    
-                    print(f"  • {task_display}")
-                    print(f"    UUID: {task_info['task_uuid'][:8]}... | 权重: {task_info['dynamic_weight']:.1f}")
-                    
-                    # 显示时间压力详情
-                    if task_info['time_pressure'] > 0:
-                        time_info = task_info['time_pressure_info']
-                        print(f"    {time_info['color']} 时间压力: {time_info['level']} ({time_info['desc']}) +{task_info['time_pressure']:.0f}%")
-                    print()
+                print(f"  • {task_display}")
+                print(f"    UUID: {short_uuid(task_info.task_uuid)}... | 权重: {task_info.dynamic_weight:.1f}")
                 
-                if len(tasks) > 5:
-                    print(f"  ... 还有 {len(tasks) - 5} 个任务")
+                # 显示时间压力详情
+                if task_info.time_pressure > 0:
+                    time_info = task_info.time_pressure_info
+                    print(f"    {time_info['color']} 时间压力: {time_info['level']} ({time_info['desc']}) +{task_info.time_pressure:.0f}%")
+                print()
+            
+            if len(tasks) > 5:
+                print(f"  ... 还有 {len(tasks) - 5} 个任务")
     
     def analyze_task_detailed(self, task_uuid: str):
         """详细任务分析"""
-        priority_info = self.calculate_smart_priority(task_uuid)
+        priority_info = self.score_task(task_uuid)
         
         if not priority_info:
             print(f"❌ 未找到UUID为 {task_uuid} 的任务")
@@ -561,177 +2876,118 @@ class TodoManager:
         print("="*70)
         
         # 任务基本信息
-        task_display = self._truncate_text(priority_info['task'], 60)
+        task_display = self._truncate_text(priority_info.task, 60)
         print(f"📋 任务: {task_display}")
-        print(f"🔗 UUID: {priority_info['task_uuid']}")
+        print(f"🔗 UUID: {priority_info.task_uuid}")
         
         # 优先级分析
         print(f"\n🎯 优先级分析:")
-        print(f"   原始优先级: {priority_info['base_priority']}")
-        print(f"   智能优先级: {priority_info['final_priority']}")
+        print(f"   原始优先级: {priority_info.base_priority}")
+        print(f"   智能优先级: {priority_info.final_priority}")
         
         # 权重分析
         print(f"\n⚖️ 权重构成分析:")
-        print(f"   基础权重: {priority_info['base_weight']}")
-        print(f"   动态权重: {priority_info['dynamic_weight']:.1f}/150")
+        print(f"   基础权重: {priority_info.base_weight}")
+        print(f"   动态权重: {priority_info.dynamic_weight:.1f}/{self.rules.weight_cap:.0f}")
         
         # 详细的时间压力分析
-        time_info = priority_info['time_pressure_info']
+        time_info = priority_info.time_pressure_info
         print(f"\n⏰ 时间压力详析:")
         print(f"   {time_info['color']} 压力等级: {time_info['level']} ({time_info['desc']})")
-        print(f"   📈 权重贡献: +{priority_info['time_pressure']:.1f}%")
+        print(f"   📈 权重贡献: +{priority_info.time_pressure:.1f}%")
         
         # 行动建议
-        display = priority_info['display_info']
+        display = priority_info.display_info
         print(f"\n💡 推荐行动:")
         print(f"   {display['action']}")
         print(f"   建议提示: {', '.join(display['tips'][:2])}")
         print(f"   时间安排: {time_info['advice']}")
     
     def calculate_smart_priority(self, task_uuid: str) -> Dict:
-        """计算智能优先级"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            # 获取最新任务信息
-            cursor.execute('''
-                SELECT 
-                    u.task, u.priority, u.due_date, u.created_at, u.task_type, u.estimated_hours
-                FROM todo_unified u
-                JOIN (
-                    SELECT task_uuid, MAX(version) as max_version
-                    FROM todo_unified GROUP BY task_uuid
-                ) latest ON u.task_uuid = latest.task_uuid AND u.version = latest.max_version
-                WHERE u.task_uuid = ? AND u.operation_type != 'delete'
-            ''', (task_uuid,))
-            
-            result = cursor.fetchone()
-            if not result:
-                return None
-            
-            task, base_priority, due_date, created_at, task_type, estimated_hours = result
-            
-            # 获取基础权重
-            base_info = self.eisenhower_matrix.get(base_priority, self.eisenhower_matrix['normal'])
-            base_weight = base_info['weight']
-            
-            # 计算时间压力权重
-            time_pressure, time_pressure_info = self._calculate_time_pressure_with_info(due_date, created_at)
-            
-            # 计算任务类型权重
-            type_weight = self._calculate_type_weight(task_type or 'general')
-            
-            # 工作量权重
-            effort_weight = self._calculate_effort_weight(estimated_hours or 0)
-            
-            # 综合计算动态权重
-            dynamic_weight = base_weight * (1 + time_pressure + type_weight + effort_weight)
-            dynamic_weight = min(dynamic_weight, 150)  # 设置上限
-            
-            # 确定最终优先级
-            final_priority = self._determine_final_priority(dynamic_weight, base_priority)
-            
-            return {
-                'task_uuid': task_uuid,
-                'task': task,
-                'base_priority': base_priority,
-                'final_priority': final_priority,
-                'base_weight': base_weight,
-                'dynamic_weight': round(dynamic_weight, 1),
-                'time_pressure': round(time_pressure * 100, 1),
-                'time_pressure_info': time_pressure_info,
-                'type_bonus': round(type_weight * 100, 1),
-                'effort_bonus': round(effort_weight * 100, 1),
-                'display_info': self.eisenhower_matrix[final_priority],
-                'due_date': due_date,
-                'created_at': created_at
-            }
+        """计算智能优先级 (兼容旧版的字典格式)"""
+        score = self.score_task(task_uuid)
+        return score.as_dict() if score else None
+    
+    def score_task(self, task_uuid: str) -> Optional[TaskScore]:
+        """计算单个任务的智能优先级评分 (也接受尚未写入的重复任务实例 UUID)"""
+        scores = self._query_current_scores(TaskQuery(task_uuid=task_uuid))
+        if len(scores):
+            return scores[0]
+        occurrence = self._resolve_occurrence(task_uuid)
+        return self._score_row(occurrence.score_row(), _today_day_number()) if occurrence else None
+    
+    def score_tasks(self, status_filter: Optional[str] = None, date_from: Optional[str] = None,
+                    date_to: Optional[str] = None, order_by: str = 'created',
+                    top: Optional[int] = None, quadrant: Optional[str] = None,
+                    recurring: bool = True) -> TaskScoreTable:
+        """批量计算当前活跃任务的智能优先级，返回列式结果
+        
+        order_by: created (最新创建在前) | id | due
+        top: 只取动态权重最高的 N 个 (SQLite 内 ORDER BY smart_weight(...) LIMIT N，内存引擎用堆选)
+        quadrant: 只取指定象限 Q1-Q4 (SQLite 内按 smart_quadrant(...) 过滤)
+        recurring: 包含日期窗口内尚未写入的重复任务实例 (排在真实任务之后)
+        """
+        due_from, due_to = self._due_range(date_from, date_to)
+        return self._query_current_scores(TaskQuery(
+            status=status_filter, due_from=due_from, due_to=due_to,
+            quadrant=quadrant, order_by=order_by, top=top
+        ), recurring=recurring)
+    
+    def _score_row(self, row: tuple, today: int) -> TaskScore:
+        """根据一行最新版本数据计算评分"""
+        task_uuid, task, base_priority, due_date, created_at, task_type, estimated_hours, due_day = row
+        
+        # 获取基础权重
+        base_weight = self.rules.base_weight(base_priority)
+        
+        # 计算时间压力权重
+        time_pressure, pressure_key, remaining_days = self.rules.time_pressure(due_day, today)
+        
+        # 计算任务类型权重
+        type_weight = self._calculate_type_weight(task_type or 'general')
+        
+        # 工作量权重
+        effort_weight = self._calculate_effort_weight(estimated_hours or 0)
+        
+        # 综合计算动态权重
+        dynamic_weight = base_weight * (1 + time_pressure + type_weight + effort_weight)
+        dynamic_weight = min(dynamic_weight, self.rules.weight_cap)  # 设置上限
+        
+        # 确定最终优先级
+        final_priority = self._determine_final_priority(dynamic_weight, base_priority)
+        
+        return TaskScore(
+            task_uuid, task, base_priority, final_priority, base_weight,
+            round(dynamic_weight, 1), round(time_pressure * 100, 1), pressure_key, remaining_days,
+            round(type_weight * 100, 1), round(effort_weight * 100, 1), due_date, created_at
+        )
     
     def _calculate_time_pressure_with_info(self, due_date: str, created_date: str) -> tuple:
         """计算时间压力权重并返回详细信息"""
-        if not due_date:
-            return 0.0, self.time_pressure_levels[0.0]
-            
-        try:
-            due = datetime.strptime(due_date, '%Y-%m-%d')
-            now = datetime.now()
-            created = datetime.strptime(created_date, '%Y-%m-%d %H:%M:%S') if created_date else now
-            
-            remaining_time = (due - now).days
-            
-            # 时间压力递增曲线
-            if remaining_time <= 0:
-                pressure = 0.5  # 逾期，高压力
-            elif remaining_time <= 1:
-                pressure = 0.4  # 今明两天
-            elif remaining_time <= 3:
-                pressure = 0.3  # 3天内
-            elif remaining_time <= 7:
-                pressure = 0.2  # 一周内
-            else:
-                pressure = 0.1  # 一周以上
-            
-            # 获取对应的压力信息
-            pressure_info = self.time_pressure_levels[pressure].copy()
+        return self._calculate_time_pressure_from_day(_to_day_number(due_date))
+    
+    def _calculate_time_pressure_from_day(self, due_day: Optional[int], today: Optional[int] = None) -> tuple:
+        """根据整数截止天数计算时间压力并返回详细信息"""
+        pressure, level_key, remaining_time = self.rules.time_pressure(due_day, _today_day_number() if today is None else today)
+        
+        # 获取对应的压力信息
+        pressure_info = dict(self.time_pressure_levels[level_key])
+        if remaining_time is not None:
             pressure_info['remaining_days'] = remaining_time
-            
-            return pressure, pressure_info
-                
-        except (ValueError, TypeError):
-            return 0.0, self.time_pressure_levels[0.0]
+        
+        return pressure, pressure_info
     
     def _calculate_type_weight(self, task_type: str) -> float:
         """根据任务类型计算权重"""
-        type_weights = {
-            # [紧急响应]
-            'emergency': 0.4,         # 紧急事务
-            'security': 0.4,          # 安全相关
-            'bug_fix': 0.35,          # Bug修复
-            
-            # [业务核心]
-            'client': 0.3,            # 客户相关
-            'deadline': 0.3,          # 有明确截止日期
-            'development': 0.2,       # 开发任务
-            
-            # [协调沟通]
-            'meeting': 0.25,          # 会议
-            'communication': 0.15,    # 沟通协调
-            
-            # [支撑运营]
-            'maintenance': 0.08,      # 维护任务
-            'routine': 0.05,          # 日常事务
-            
-            # [发展提升]
-            'research': 0.12,         # 研究任务
-            
-            # [通用任务]
-            'general': 0.0            # 普通任务
-        }
-        return type_weights.get(task_type.lower(), 0.0)
+        return self.rules.type_weight(task_type)
     
     def _calculate_effort_weight(self, estimated_hours: float) -> float:
         """根据预估工时计算权重"""
-        if estimated_hours <= 0:
-            return 0.0
-        elif estimated_hours <= 2:
-            return 0.05  # 小任务，稍微提升
-        elif estimated_hours <= 8:
-            return 0.1   # 中等任务
-        elif estimated_hours <= 24:
-            return 0.15  # 大任务，需要规划
-        else:
-            return 0.2   # 超大任务，重点关注
+        return self.rules.effort_weight(estimated_hours)
     
     def _determine_final_priority(self, weight: float, base_priority: str) -> str:
         """根据动态权重确定最终优先级"""
-        if weight >= 120:
-            return 'urgent_important'
-        elif weight >= 90:
-            return 'important'
-        elif weight >= 60:
-            return 'urgent'
-        else:
-            return 'normal'
+        return self.rules.final_priority(weight)
     
     def _truncate_text(self, text: str, max_length: int) -> str:
         """智能截断文本，保持可读性"""
@@ -747,37 +3003,24 @@ class TodoManager:
         else:
             return truncated + "..."
     
-    def export_data(self, export_path: str = None):
-        """导出数据到JSON文件"""
+    def export_data(self, export_path: str = None, board: Optional[str] = None):
+        """导出一个看板 (默认当前看板) 的全部版本记录到JSON文件"""
+        board = board or self.board
         if not export_path:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            export_path = f"todo_export_{timestamp}.json"
+            export_path = f"todo_export_{board}_{timestamp}.json"
         
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute('SELECT * FROM todo_unified ORDER BY created_at')
-            
-            # 获取列名
-            columns = [description[0] for description in cursor.description]
-            
-            # 获取所有数据
-            rows = cursor.fetchall()
-            
-            # 转换为字典列表
-            data = []
-            for row in rows:
-                record = dict(zip(columns, row))
-                data.append(record)
+        data = [record._asdict() for record in self.store.iter_records(board)]
         
         # 导出到JSON文件
         with open(export_path, 'w', encoding='utf-8') as f:
             json.dump(data, f, ensure_ascii=False, indent=2)
         
-        print(f"✅ 数据已导出到: {export_path}")
+        print(f"✅ 看板 {board} 的数据已导出到: {export_path}")
         print(f"📊 导出记录数: {len(data)}")
     
-    def import_data(self, import_path: str):
-        """从JSON文件导入数据"""
+    def import_data(self, import_path: str, check_duplicates: bool = False):
+        """从JSON文件导入数据 (check_duplicates 为真时跳过与已有任务或本次导入任务近似重复的任务)"""
         if not os.path.exists(import_path):
             print(f"❌ 文件不存在: {import_path}")
             return
@@ -793,42 +3036,359 @@ class TodoManager:
             print("❌ 导入文件格式错误，需要JSON数组格式")
             return
         
-        # 导入数据
-        imported_count = 0
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            for record in data:
-                try:
-                    cursor.execute('''
-                        INSERT INTO todo_unified (
-                            task_uuid, version, task, status, priority, due_date, 
-                            task_type, estimated_hours, operation_type, change_summary, 
-                            created_at, updated_at
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        record.get('task_uuid'),
-                        record.get('version', 1),
-                        record.get('task', ''),
-                        record.get('status', 'todo'),
-                        record.get('priority', 'normal'),
-                        record.get('due_date'),
-                        record.get('task_type', 'general'),
-                        record.get('estimated_hours', 0),
-                        record.get('operation_type', 'migration'),
-                        record.get('change_summary', 'Imported from JSON'),
-                        record.get('created_at'),
-                        record.get('updated_at')
-                    ))
-                    imported_count += 1
-                except sqlite3.Error as e:
-                    print(f"⚠️ 跳过记录 (UUID: {record.get('task_uuid', 'unknown')}): {e}")
-                    continue
-            
-            conn.commit()
+        # 导入数据到当前看板 (单次批量写入；重复的 task_uuid + version 会被跳过)
+        records = (TaskRecord(
+            None,
+            record.get('task_uuid'),
+            record.get('version', 1),
+            record.get('task', ''),
+            record.get('status', 'todo'),
+            record.get('priority', 'normal'),
+            record.get('due_date'),
+            record.get('task_type', 'general'),
+            record.get('estimated_hours', 0),
+            record.get('operation_type', 'migration'),
+            record.get('change_summary', 'Imported from JSON'),
+            record.get('created_at'),
+            record.get('updated_at'),
+            _to_day_number(record.get('due_date')),
+            _to_day_number(record.get('created_at')),
+            self.board
+        ) for record in data)
+        records = self._rename_foreign_uuids(list(records))
+        if check_duplicates:
+            records = self._drop_duplicate_imports(records)
+        
+        imported_count, skipped = self.store.bulk_load(records)
+        for task_uuid, error in skipped:
+            print(f"⚠️ 跳过记录 (UUID: {task_uuid}): {error}")
         
         print(f"✅ 数据导入完成!")
         print(f"📊 成功导入: {imported_count} 条记录")
+        if skipped:
+            print(f"⚠️ 跳过: {len(skipped)} 条记录")
+    
+    def _rename_foreign_uuids(self, records: List[TaskRecord]) -> List[TaskRecord]:
+        """(task_uuid, version) 在整个数据库唯一: UUID 已被其他看板使用的任务 (如把看板 A 的导出导入看板 C)
+        换发新 UUID，使看板能整体复制。新 UUID 由当前看板和原 UUID 确定，重复导入同一文件仍按唯一约束跳过。
+        """
+        task_uuids = {record.task_uuid for record in records}
+        foreign = self.store.existing_uuids(None, task_uuids) - self.store.existing_uuids(self.board, task_uuids)
+        if not foreign:
+            return records
+        renamed = {task_uuid: str(uuid.uuid5(uuid.NAMESPACE_URL, f'{self.board}/{task_uuid}')) for task_uuid in foreign}
+        print(f"🔁 {len(foreign)} 个任务的 UUID 已被其他看板使用，导入到看板 {self.board} 时换发新 UUID")
+        return [record._replace(task_uuid=renamed.get(record.task_uuid, record.task_uuid)) for record in records]
+    
+    def _drop_duplicate_imports(self, records: List[TaskRecord]) -> List[TaskRecord]:
+        """去掉与已有任务或文件中更早任务近似重复的任务 (按各任务在文件中的最新版本判断)"""
+        newest = {}
+        for record in records:
+            current = newest.get(record.task_uuid)
+            if current is None or current.version < record.version:
+                newest[record.task_uuid] = record
+        
+        accepted = LSHIndex()
+        accepted_shingles = {}
+        dropped = {}
+        for task_uuid, record in newest.items():
+            shingles = _char_shingles(record.task)
+            if record.operation_type == 'delete' or not shingles:
+                continue
+            # 与已存储的任务比较 (同一任务的重复导入交给唯一约束处理)
+            duplicate = next((existing for existing, _ in self.find_duplicates(record.task, exclude_uuid=task_uuid)), None)
+            if duplicate is None:
+                band_keys = _task_band_keys(record.task)
+                match = next((other for other in accepted.candidates(band_keys)
+                              if _jaccard(shingles, accepted_shingles[other]) >= _DUPLICATE_THRESHOLD), None)
+                if match is None:
+                    accepted.add(task_uuid, band_keys)
+                    accepted_shingles[task_uuid] = shingles
+                    continue
+                duplicate = newest[match]
+            dropped[task_uuid] = (record, duplicate)
+        
+        if dropped:
+            print(f"⚠️ 跳过 {len(dropped)} 个近似重复的任务:")
+            for record, duplicate in list(dropped.values())[:10]:
+                print(f"   {self._truncate_text(record.task, 40)}  ≈  {self._truncate_text(duplicate.task, 40)} ({duplicate.task_uuid[:8]})")
+            if len(dropped) > 10:
+                print(f"   ... 另有 {len(dropped) - 10} 个")
+        return [record for record in records if record.task_uuid not in dropped]
+    
+    def show_boards(self):
+        """列出所有看板及其活跃任务数、版本记录数"""
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                SELECT b.board, b.owner, b.archived, b.archived_at,
+                       (SELECT COUNT(*) FROM todo_unified u
+                        WHERE u.board = b.board AND {_LATEST_VERSION_SQL} AND u.operation_type != 'delete') AS active,
+                       (SELECT COUNT(*) FROM todo_unified u WHERE u.board = b.board) AS records
+                FROM todo_boards b
+                ORDER BY b.board
+            ''')
+            boards = cursor.fetchall()
+        
+        if not boards:
+            print("📝 暂无看板")
+            return
+        
+        print(f"\n🗂️ 看板列表 (共 {len(boards)} 个)")
+        print("=" * 80)
+        print(f"{'看板':<20} {'负责人':<15} {'活跃任务':<10} {'版本记录':<10} {'状态':<20}")
+        print("-" * 80)
+        for board, owner, archived, archived_at, active, records in boards:
+            marker = '▶ ' if board == self.board else '  '
+            state = f"已归档 {archived_at}" if archived else "活跃"
+            print(f"{marker}{board:<18} {owner or '-':<15} {active:<10} {records:<10} {state:<20}")
+    
+    def archive_board(self, board: str, archived: bool = True) -> bool:
+        """归档 (只读) 或恢复一个看板"""
+        def write_archived(cursor):
+            cursor.execute('''
+                UPDATE todo_boards
+                SET archived = ?, archived_at = CASE WHEN ? THEN CURRENT_TIMESTAMP END
+                WHERE board = ?
+            ''', (int(archived), int(archived), board))
+            return cursor.rowcount
+        
+        if not self._run_write(write_archived, check_board=False):
+            print(f"❌ 未找到看板: {board}")
+            return False
+        print(f"✅ 看板 {board} 已{'归档 (只读)' if archived else '恢复'}")
+        return True
+    
+    def delete_board(self, board: str) -> int:
+        """彻底删除一个看板的全部任务和版本历史 (不可恢复，建议先 board export)"""
+        def write_delete(cursor):
+            cursor.execute('DELETE FROM todo_unified WHERE board = ?', (board,))
+            deleted = cursor.rowcount
+            cursor.execute('DELETE FROM todo_lsh WHERE board = ?', (board,))
+            cursor.execute('DELETE FROM todo_recurring WHERE board = ?', (board,))
+            cursor.execute('DELETE FROM todo_boards WHERE board = ?', (board,))
+            return deleted if deleted or cursor.rowcount else None
+        
+        deleted = self._run_write(write_delete, check_board=False)
+        if deleted is None:
+            print(f"❌ 未找到看板: {board}")
+            return 0
+        print(f"✅ 看板 {board} 已删除")
+        print(f"   删除版本记录: {deleted} 条")
+        return deleted
+    
+    def maintain(self, max_steps: Optional[int] = None, step_pages: int = _MAINTAIN_STEP_PAGES,
+                 full: bool = True, quiet: bool = False) -> Dict[str, Any]:
+        """数据库维护 (见 SQLiteTaskStore.maintain)，quiet 为 False 时打印维护报告"""
+        report = self._sqlite_store().maintain(max_steps, step_pages, full)
+        if not quiet:
+            self._print_maintenance_report(report)
+        return report
+    
+    def _print_maintenance_report(self, report: Dict[str, Any]):
+        before, after = report['before'], report['after']
+        
+        def size(value: int) -> str:
+            return f"{value / 1024 / 1024:.1f} MB"
+        
+        print(f"\n🧹 数据库维护{'' if report['full'] else ' (轻量)'}: {self.db_path}")
+        print("=" * 80)
+        print(f"{'步骤':<24} {'耗时':>8}   结果")
+        print("-" * 80)
+        for step in report['steps']:
+            print(f"{step['step']:<24} {step['seconds']:>7.2f}s   {step['detail']}")
+        
+        print(f"\n{'':<16} {'维护前':>16} {'维护后':>16}")
+        print("-" * 52)
+        print(f"{'页数':<16} {before['page_count']:>16} {after['page_count']:>16}")
+        print(f"{'空闲页':<16} {before['freelist_count']:>9} ({before['free_ratio']:>5.1%}) "
+              f"{after['freelist_count']:>9} ({after['free_ratio']:>5.1%})")
+        if 'unused_ratio' in before and 'unused_ratio' in after:
+            print(f"{'页内未用空间':<16} {before['unused_ratio']:>16.1%} {after['unused_ratio']:>16.1%}")
+        print(f"{'数据库文件':<16} {size(before['file_bytes']):>16} {size(after['file_bytes']):>16}")
+        print(f"{'WAL 文件':<16} {size(before['wal_bytes']):>16} {size(after['wal_bytes']):>16}")
+        print(f"{'auto_vacuum':<16} {before['auto_vacuum']:>16} {after['auto_vacuum']:>16}")
+        
+        objects = after.get('objects')
+        if objects:
+            print(f"\n📦 主要表/索引 (维护后):")
+            for name, info in list(objects.items())[:6]:
+                print(f"   {name:<32} {info['pages']:>8} 页  页内未用 {info['unused_ratio']:.1%}")
+        if after.get('unused_ratio', 0) > 0.25 and after['page_count'] > 1000:
+            print("\n💡 页内未用空间较高 (软删除/批量删除后常见)，增量回收只释放整页，可在低峰期执行一次 VACUUM 重排")
+        print(f"\n⏱️ 总耗时: {report['seconds']:.2f}s")
+    
+    # 统计指标: 名称 -> 标题
+    STATS_METRICS = {
+        'throughput-day': '📈 每日完成量',
+        'throughput-week': '📈 每周完成量',
+        'cycle': '⏱️ 周期时间 (小时)',
+        'quadrant': '🎯 各象限停留时间 (天)',
+        'estimate': '📐 预估 vs 实际 (按任务类型，小时)',
+        'overdue': '🚨 逾期率',
+    }
+    
+    def _history_sql(self, date_from: Optional[str], date_to: Optional[str]) -> tuple:
+        """版本历史的窗口函数查询: 每个版本附带上一状态、下一版本时间、任务首个版本时间和截至该版本的首次开始时间
+        
+        返回 (history 查询, 其参数, 完成事件的日期条件, 其参数)。
+        """
+        range_conditions = []
+        range_params = []
+        for value, operator in ((date_from, '>='), (date_to, '<=')):
+            if not value:
+                continue
+            day = _to_day_number(value)
+            if day is None:
+                raise ValueError(f"无效日期: {value} (格式: YYYY-MM-DD)")
+            range_conditions.append(f'created_day {operator} ?')
+            range_params.append(day)
+        
+        # 只对当前看板做窗口计算; 指定日期范围时进一步圈定范围内有事件的任务 (idx_board_created_day_task 覆盖索引)
+        scope = 'WHERE board = ?'
+        scope_params = [self.board]
+        if range_conditions:
+            scope += (" AND task_uuid IN (SELECT task_uuid FROM todo_unified WHERE board = ? AND "
+                      f"{' AND '.join(range_conditions)})")
+            scope_params += [self.board] + range_params
+        event_range = ''.join(f' AND {condition}' for condition in range_conditions)
+        
+        # 内层先把时间文本换算为 julianday，窗口函数只处理数值列
+        history = f'''
+            SELECT task_uuid, version, status, priority, task_type, estimated_hours, due_day,
+                   operation_type, created_day, ts,
+                   LAG(status) OVER w AS prev_status,
+                   LEAD(ts) OVER w AS next_ts,
+                   FIRST_VALUE(ts) OVER w AS first_ts,
+                   MIN(CASE WHEN status = 'in_progress' THEN ts END) OVER w AS start_ts
+            FROM (
+                SELECT task_uuid, version, status, priority, task_type, estimated_hours, due_day,
+                       operation_type, created_day, julianday(created_at) AS ts
+                FROM todo_unified
+                {scope}
+            )
+            WINDOW w AS (PARTITION BY task_uuid ORDER BY version)
+        '''
+        return history, scope_params, event_range, range_params
+    
+    def iter_stats(self, metric: str, date_from: Optional[str] = None, date_to: Optional[str] = None):
+        """在 SQLite 内计算流转指标，逐行产出字典 (流式，不整体载入内存)"""
+        with self._connect() as conn:
+            yield from self._iter_stats(conn, metric, date_from, date_to, materialized=False)
+    
+    def _iter_stats(self, conn, metric: str, date_from: Optional[str], date_to: Optional[str], materialized: bool):
+        """执行单个统计指标查询; materialized 为真时复用连接上已建好的 temp.history 表"""
+        if metric not in self.STATS_METRICS:
+            raise ValueError(f"未知统计指标: {metric} (可选: {', '.join(self.STATS_METRICS)})")
+        if sqlite3.sqlite_version_info < (3, 25, 0):
+            raise RuntimeError(f"stats 需要 SQLite 3.25+ 的窗口函数支持 (当前 {sqlite3.sqlite_version})")
+        
+        history, history_params, event_range, event_params = self._history_sql(date_from, date_to)
+        derived = f'''
+            completions AS (
+                SELECT task_uuid, task_type, estimated_hours, due_day, created_day, ts, first_ts, start_ts
+                FROM history
+                WHERE status = 'completed' AND operation_type != 'delete'
+                  AND (prev_status IS NULL OR prev_status != 'completed'){event_range}
+            )
+        '''
+        if materialized:
+            cte = f'WITH {derived}'
+            params = list(event_params)
+        else:
+            cte = f'WITH history AS ({history}), {derived}'
+            params = history_params + event_params
+        
+        if metric in ('throughput-day', 'throughput-week'):
+            period = 'date(ts)' if metric == 'throughput-day' else "strftime('%Y-W%W', ts)"
+            query = f'''
+                SELECT {period} AS period, COUNT(*) AS completed
+                FROM completions
+                GROUP BY period
+                ORDER BY period
+            '''
+        elif metric == 'cycle':
+            query = '''
+                SELECT COUNT(*) AS completed,
+                       ROUND(AVG((c.start_ts - c.first_ts) * 24), 2) AS todo_to_in_progress,
+                       ROUND(AVG((c.ts - c.start_ts) * 24), 2) AS in_progress_to_completed,
+                       ROUND(AVG((c.ts - c.first_ts) * 24), 2) AS lead_time
+                FROM completions c
+            '''
+        elif metric == 'quadrant':
+            query = f'''
+                SELECT priority, COUNT(DISTINCT task_uuid) AS tasks,
+                       ROUND(SUM(COALESCE(next_ts, julianday('now')) - ts), 2) AS total_days,
+                       ROUND(SUM(COALESCE(next_ts, julianday('now')) - ts) / COUNT(DISTINCT task_uuid), 2) AS avg_days_per_task
+                FROM history
+                WHERE operation_type != 'delete'{event_range}
+                GROUP BY priority
+                ORDER BY total_days DESC
+            '''
+            params += event_params
+        elif metric == 'estimate':
+            query = '''
+                SELECT COALESCE(c.task_type, 'general') AS task_type, COUNT(*) AS completed,
+                       ROUND(AVG(c.estimated_hours), 2) AS avg_estimated,
+                       ROUND(AVG((c.ts - COALESCE(c.start_ts, c.first_ts)) * 24), 2) AS avg_actual,
+                       ROUND(AVG((c.ts - COALESCE(c.start_ts, c.first_ts)) * 24) / NULLIF(AVG(c.estimated_hours), 0), 2) AS actual_to_estimate
+                FROM completions c
+                GROUP BY 1
+                ORDER BY completed DESC
+            '''
+        else:
+            query = f'''
+                SELECT COUNT(*) AS completed_with_due,
+                       COALESCE(SUM(created_day > due_day), 0) AS completed_late,
+                       ROUND(100.0 * SUM(created_day > due_day) / NULLIF(COUNT(*), 0), 1) AS late_rate_percent,
+                       (SELECT COUNT(*) FROM todo_unified u
+                        WHERE {self._current_where(["u.status != 'completed'", 'u.due_day IS NOT NULL'])}) AS open_with_due,
+                       (SELECT COUNT(*) FROM todo_unified u
+                        WHERE {self._current_where(["u.status != 'completed'", 'u.due_day < ?'])}) AS open_overdue
+                FROM completions
+                WHERE due_day IS NOT NULL
+            '''
+            params += [self.board, self.board, _today_day_number()]
+        
+        cursor = conn.execute(cte + query, params)
+        columns = [description[0] for description in cursor.description]
+        for row in cursor:
+            yield dict(zip(columns, row))
+    
+    def show_stats(self, metric: Optional[str] = None, date_from: Optional[str] = None,
+                   date_to: Optional[str] = None, as_json: bool = False):
+        """显示历史统计，逐行输出"""
+        metrics = [metric] if metric else list(self.STATS_METRICS)
+        with self._connect() as conn:
+            # 多个指标共用一次窗口计算结果
+            materialized = len(metrics) > 1
+            if materialized:
+                history, history_params, _, _ = self._history_sql(date_from, date_to)
+                conn.execute('DROP TABLE IF EXISTS temp.history')
+                conn.execute(f'CREATE TEMP TABLE history AS {history}', history_params)
+            
+            for name in metrics:
+                rows = self._iter_stats(conn, name, date_from, date_to, materialized)
+                if as_json:
+                    for row in rows:
+                        print(json.dumps(dict(row, metric=name), ensure_ascii=False))
+                    continue
+                
+                print(f"\n{self.STATS_METRICS[name]}")
+                print("─" * 80)
+                header_printed = False
+                for row in rows:
+                    if not header_printed:
+                        print(' '.join(f"{column:<24}" for column in row))
+                        header_printed = True
+                    print(' '.join(f"{'-' if value is None else value!s:<24}" for value in row.values()))
+                    sys.stdout.flush()
+                if not header_printed:
+                    print("  📝 暂无数据")
+    
+    def show_rules(self):
+        """输出当前生效的评分规则 (JSON，可直接保存为配置文件修改)"""
+        print(json.dumps(self.rules.config, ensure_ascii=False, indent=2))
     
     def show_help(self):
         """显示帮助信息"""
@@ -839,18 +3399,60 @@ class TodoManager:
    python3 todo_manager.py create "任务内容" [priority] [due_date] [task_type] [estimated_hours]
    python3 todo_manager.py update <UUID> <field> <value>
    python3 todo_manager.py show <UUID>
-   python3 todo_manager.py search "关键词"
+   python3 todo_manager.py search "关键词" [--from YYYY-MM-DD] [--to YYYY-MM-DD]
    python3 todo_manager.py delete <UUID>
 
+📦 批量操作 (单条语句、单个事务):
+   python3 todo_manager.py bulk-update --where status=todo --where task_type=routine --set status=completed [--dry-run]
+   python3 todo_manager.py bulk-delete --search "关键词" [--where field=value] [--from D] [--to D] [--dry-run]
+
 🎯 智能优先级功能:
    python3 todo_manager.py list [status]          # 智能优先级任务列表 (推荐)
    python3 todo_manager.py list --basic [status]  # 传统基础列表
+   python3 todo_manager.py list --from D --to D   # 按截止日期范围筛选
+   python3 todo_manager.py due --within N         # N天内到期的任务 (默认3天)
+   python3 todo_manager.py overdue                # 已逾期任务
+   python3 todo_manager.py list --top N           # 权重最高的N个任务 (数据库内排序)
    python3 todo_manager.py matrix                 # 艾森豪威尔矩阵视图
+   python3 todo_manager.py matrix --quadrant Q1   # 只看某个象限 (数据库内过滤)
+   python3 todo_manager.py rules                  # 输出当前评分规则 (JSON)
    python3 todo_manager.py analyze <UUID>         # 详细任务分析
+   python3 todo_manager.py watch [list|matrix] [status] [--interval 秒]  # 实时监视，只增量刷新变化的任务
+   python3 todo_manager.py escalations [--since D] [--into Q1]  # 自某日以来跨入更高时间压力档位的任务
+   python3 todo_manager.py forecast [--days 14]   # 未来N天按日汇总的工作量预测 (含重复任务实例)
+
+🔁 重复任务 (实例按查询窗口即时展开，更新/完成时才写入):
+   python3 todo_manager.py recur add "站会" weekly --on mon,wed,fri --type meeting [--priority P] [--hours H] [--from D] [--until D]
+   python3 todo_manager.py recur add "日报" daily --type routine
+   python3 todo_manager.py recur add "月度结账" monthly --on 28
+   python3 todo_manager.py recur list             # 列出模板及下一次实例
+   python3 todo_manager.py recur delete <模板UUID>  # 停用模板
+
+⚡ 读缓存:
+   list / matrix / search / due / overdue 的结果缓存在数据库旁的 .readcache.json 中，
+   数据有任何写入即自动失效；加 --no-cache 可跳过缓存
+
+📈 历史统计 (SQLite 窗口函数):
+   python3 todo_manager.py stats [metric] [--from D] [--to D] [--json]
+   metric: throughput-day, throughput-week, cycle, quadrant, estimate, overdue (默认全部)
 
 📊 数据管理:
-   python3 todo_manager.py export [filepath]      # 导出数据到JSON
-   python3 todo_manager.py import <filepath>      # 从JSON导入数据
+   python3 todo_manager.py export [filepath]      # 导出当前看板数据到JSON
+   python3 todo_manager.py import <filepath> [--check-duplicates]  # 从JSON导入数据到当前看板 (可跳过近似重复)
+   python3 todo_manager.py dedupe [--threshold 0.8] [--merge]      # 查找近似重复任务，--merge 保留最早的一个
+   python3 todo_manager.py create "任务" ... --check-duplicates     # 已有相似任务时不创建
+
+🗂️ 看板 (团队/项目隔离):
+   所有命令都可加 --board 名称 [--owner 负责人]，只读写该看板的任务 (默认 default)
+   python3 todo_manager.py board list             # 列出看板
+   python3 todo_manager.py board export <name> [filepath]
+   python3 todo_manager.py board archive <name>   # 归档为只读
+   python3 todo_manager.py board restore <name>   # 取消归档
+   python3 todo_manager.py board delete <name> --yes  # 彻底删除看板 (不可恢复)
+
+🧹 数据库维护:
+   python3 todo_manager.py maintain [--steps N] [--json]  # ANALYZE、增量回收空闲页、截断 WAL、quick_check
+   任意命令加 --auto-maintain (或设置 TODO_AUTO_MAINTAIN=1)，每累计一定写入自动做一次轻量维护
 
 🏷️ 支持的优先级:
    • urgent_important  - 🔥 紧急且重要 (Q1)
@@ -870,6 +3472,10 @@ class TodoManager:
    • 时间压力自动感知和可视化显示
    • 透明化的决策支持和行动建议
 
+⚙️ 自定义评分规则:
+   python3 todo_manager.py rules > rules.json     # 导出默认规则后修改
+   python3 todo_manager.py list --rules rules.json  # 或设置环境变量 TODO_SCORING_RULES=rules.json
+
 💡 使用建议:
    • 每天使用 list 命令查看智能排序的任务
    • 每周使用 matrix 命令分析任务分布
@@ -877,6 +3483,41 @@ class TodoManager:
         """
         print(help_text)
 
+def _get_option(args: List[str], name: str) -> Optional[str]:
+    """读取命令行选项值，如 --within 3"""
+    if name in args:
+        index = args.index(name)
+        if index + 1 < len(args):
+            return args[index + 1]
+    return None
+
+def _get_options(args: List[str], name: str) -> List[str]:
+    """读取可重复的命令行选项值，如 --where status=todo --where task_type=routine"""
+    return [args[i + 1] for i, arg in enumerate(args[:-1]) if arg == name]
+
+def _strip_global_options(args: List[str]) -> List[str]:
+    """去掉全局选项 (--board/--owner/--rules/--no-cache/--auto-maintain)，避免被命令当作位置参数"""
+    result = []
+    skip = False
+    for arg in args:
+        if skip:
+            skip = False
+        elif arg in ('--board', '--owner', '--rules'):
+            skip = True
+        elif arg not in ('--no-cache', '--auto-maintain'):
+            result.append(arg)
+    return result
+
+def _parse_assignments(values: List[str]) -> Dict[str, str]:
+    """把 field=value 形式的参数解析为字典"""
+    result = {}
+    for item in values:
+        if '=' not in item:
+            raise ValueError(f"参数格式错误: {item} (应为 field=value)")
+        field, value = item.split('=', 1)
+        result[field.strip()] = value
+    return result
+
 def main():
     """主函数"""
     if len(sys.argv) < 2:
@@ -884,11 +3525,22 @@ def main():
         manager.show_help()
         return
     
-    manager = TodoManager()
+    # CLI 默认使用磁盘读缓存，--no-cache 关闭; --rules 指定评分规则文件; --board 指定看板
+    manager = TodoManager(read_cache=None if '--no-cache' in sys.argv else 'disk',
+                          scoring_rules=_get_option(sys.argv, '--rules'),
+                          board=_get_option(sys.argv, '--board') or 'default',
+                          owner=_get_option(sys.argv, '--owner'),
+                          auto_maintain=True if '--auto-maintain' in sys.argv else None)
+    sys.argv = _strip_global_options(sys.argv)
+    if len(sys.argv) < 2:
+        manager.show_help()
+        return
     command = sys.argv[1].lower()
     
     try:
         if command == "create":
+            check_duplicates = '--check-duplicates' in sys.argv
+            sys.argv = [arg for arg in sys.argv if arg != '--check-duplicates']
             if len(sys.argv) < 3:
                 print("❌ 请提供任务内容")
                 return
@@ -899,7 +3551,7 @@ def main():
             task_type = sys.argv[5] if len(sys.argv) > 5 else 'general'
             estimated_hours = float(sys.argv[6]) if len(sys.argv) > 6 else 0
             
-            manager.create_task(task, priority, due_date, task_type, estimated_hours)
+            manager.create_task(task, priority, due_date, task_type, estimated_hours, check_duplicates)
         
         elif command == "update":
             if len(sys.argv) < 5:
@@ -924,6 +3576,9 @@ def main():
             # 检查是否使用基础模式
             basic_mode = '--basic' in sys.argv
             status_filter = None
+            date_from = _get_option(sys.argv, '--from')
+            date_to = _get_option(sys.argv, '--to')
+            top = _get_option(sys.argv, '--top')
             
             for arg in sys.argv[2:]:
                 if arg != '--basic' and arg in ['todo', 'in_progress', 'completed']:
@@ -931,12 +3586,32 @@ def main():
                     break
             
             if basic_mode:
-                manager.show_basic_task_list(status_filter)
+                manager.show_basic_task_list(status_filter, date_from, date_to)
             else:
-                manager.list_tasks(status_filter, smart_mode=True)
+                manager.list_tasks(status_filter, smart_mode=True, date_from=date_from, date_to=date_to,
+                                   top=int(top) if top else None)
+        
+        elif command == "due":
+            within = _get_option(sys.argv, '--within')
+            manager.show_due_tasks(int(within) if within else 3)
+        
+        elif command == "overdue":
+            manager.show_overdue_tasks()
         
         elif command == "matrix":
-            manager.show_eisenhower_matrix()
+            manager.show_eisenhower_matrix(_get_option(sys.argv, '--quadrant'))
+        
+        elif command == "rules":
+            manager.show_rules()
+        
+        elif command == "watch":
+            view = 'matrix' if 'matrix' in sys.argv[2:] else 'list'
+            status_filter = next((arg for arg in sys.argv[2:] if arg in ['todo', 'in_progress', 'completed']), None)
+            interval = _get_option(sys.argv, '--interval')
+            manager.watch_board(view, status_filter, float(interval) if interval else 2.0)
+        
+        elif command == "escalations":
+            manager.show_escalations(_get_option(sys.argv, '--since'), _get_option(sys.argv, '--into'))
         
         elif command == "analyze":
             if len(sys.argv) < 3:
@@ -952,7 +3627,7 @@ def main():
                 return
             
             keyword = sys.argv[2]
-            manager.search_tasks(keyword)
+            manager.search_tasks(keyword, _get_option(sys.argv, '--from'), _get_option(sys.argv, '--to'))
         
         elif command == "delete":
             if len(sys.argv) < 3:
@@ -962,6 +3637,28 @@ def main():
             task_uuid = sys.argv[2]
             manager.delete_task(task_uuid)
         
+        elif command in ("bulk-update", "bulk-delete"):
+            filters = _parse_assignments(_get_options(sys.argv, '--where'))
+            keyword = _get_option(sys.argv, '--search')
+            date_from = _get_option(sys.argv, '--from')
+            date_to = _get_option(sys.argv, '--to')
+            dry_run = '--dry-run' in sys.argv
+            
+            if not (filters or keyword or date_from or date_to):
+                print("❌ 请至少提供一个筛选条件 (--where / --search / --from / --to)")
+                return
+            
+            if command == "bulk-update":
+                set_values = _parse_assignments(_get_options(sys.argv, '--set'))
+                manager.bulk_update(filters, set_values, keyword, date_from, date_to, dry_run)
+            else:
+                manager.bulk_delete(filters, keyword, date_from, date_to, dry_run)
+        
+        elif command == "stats":
+            metric = next((arg for arg in sys.argv[2:] if arg in TodoManager.STATS_METRICS), None)
+            manager.show_stats(metric, _get_option(sys.argv, '--from'), _get_option(sys.argv, '--to'),
+                               as_json='--json' in sys.argv)
+        
         elif command == "export":
             export_path = sys.argv[2] if len(sys.argv) > 2 else None
             manager.export_data(export_path)
@@ -972,7 +3669,63 @@ def main():
                 return
             
             import_path = sys.argv[2]
-            manager.import_data(import_path)
+            manager.import_data(import_path, check_duplicates='--check-duplicates' in sys.argv)
+        
+        elif command == "recur":
+            action = sys.argv[2] if len(sys.argv) > 2 else 'list'
+            if action == 'list':
+                manager.show_recurring()
+            elif action == 'add':
+                if len(sys.argv) < 5:
+                    print("❌ 使用方法: recur add <任务> <daily|weekly|monthly> [--on mon,wed|15] [--priority P] "
+                          "[--type T] [--hours H] [--from D] [--until D]")
+                    return
+                hours = _get_option(sys.argv, '--hours')
+                manager.add_recurring(sys.argv[3], sys.argv[4], _get_option(sys.argv, '--on'),
+                                      _get_option(sys.argv, '--priority') or 'normal',
+                                      _get_option(sys.argv, '--type') or 'general', float(hours) if hours else 0,
+                                      _get_option(sys.argv, '--from'), _get_option(sys.argv, '--until'))
+            elif action == 'delete':
+                if len(sys.argv) < 4:
+                    print("❌ 使用方法: recur delete <模板UUID>")
+                    return
+                manager.delete_recurring(sys.argv[3])
+            else:
+                print(f"❌ 未知重复任务操作: {action} (可选: list, add, delete)")
+        
+        elif command == "forecast":
+            days = _get_option(sys.argv, '--days')
+            manager.show_forecast(int(days) if days else 14)
+        
+        elif command == "dedupe":
+            threshold = _get_option(sys.argv, '--threshold')
+            manager.dedupe(float(threshold) if threshold else _DUPLICATE_THRESHOLD, merge='--merge' in sys.argv)
+        
+        elif command == "maintain":
+            steps = _get_option(sys.argv, '--steps')
+            report = manager.maintain(int(steps) if steps else None, quiet='--json' in sys.argv)
+            if '--json' in sys.argv:
+                print(json.dumps(report, ensure_ascii=False, indent=2))
+        
+        elif command == "board":
+            action = sys.argv[2] if len(sys.argv) > 2 else 'list'
+            name = sys.argv[3] if len(sys.argv) > 3 and not sys.argv[3].startswith('--') else None
+            if action == 'list':
+                manager.show_boards()
+            elif not name:
+                print(f"❌ 使用方法: board {action} <name>")
+            elif action == 'export':
+                path = sys.argv[4] if len(sys.argv) > 4 and not sys.argv[4].startswith('--') else None
+                manager.export_data(path, board=name)
+            elif action in ('archive', 'restore'):
+                manager.archive_board(name, archived=action == 'archive')
+            elif action == 'delete':
+                if '--yes' not in sys.argv:
+                    print(f"⚠️ 将彻底删除看板 {name} 的全部任务和历史，确认请加 --yes (建议先 board export)")
+                    return
+                manager.delete_board(name)
+            else:
+                print(f"❌ 未知看板操作: {action} (可选: list, export, archive, restore, delete)")
         
         elif command == "help":
             manager.show_help()